@@ -6,6 +6,7 @@ from src.agents.correlation_agent import AutonomousCorrelationAgent
 from src.agents.monitoring_agent import AutonomousMonitoringAgent
 from src.agents.problem_agent import AutonomousProblemAgent
 from src.data.loader import DataLoader
+from src.data.monitoring_results import MonitoringResultStore
 from src.models.incident import Incident, SeverityLevel, IncidentStatus
 from src.models.problem import Problem, ProblemStatus, ProblemPriority
 
@@ -92,6 +93,14 @@ def correlation_demo():
         col1.metric("Decisions Made", metrics['decisions_made'])
         col2.metric("Autonomous Actions", metrics['autonomous_actions'])
         col3.metric("Accuracy Score", f"{metrics['accuracy_score']:.2f}")
+    
+    # Whole-queue escalation ranking, recomputed every refresh
+    with st.expander("📊 Queue Escalation Risk"):
+        ranking = st.session_state.correlation_agent.rank_escalation_risk(all_incidents=incidents)
+        for item in ranking[:10]:
+            risk_color = "🔴" if item['escalation_probability'] > 0.7 else "🟡" if item['escalation_probability'] > 0.3 else "🟢"
+            st.markdown(f"{item['rank']}. {risk_color} **{item['incident_id']}** ({item['severity']}, "
+                        f"{item['affected_system']}): {item['escalation_probability']:.1%}")
 
 def monitoring_demo():
     st.header("📊 Proactive Monitoring Agent")
@@ -134,6 +143,8 @@ def monitoring_demo():
                         
                         if issue.auto_executed:
                             st.success("✅ Autonomous action taken")
+                        elif issue.suppressed:
+                            st.info("🔕 Action already taken - repeat suppressed")
                         else:
                             st.warning("⚠️ Human review required")
                         
@@ -148,6 +159,26 @@ def monitoring_demo():
             else:
                 st.info("No critical issues detected")
     
+    # Latest result published by the scheduled monitoring daemon
+    with st.expander("🛰️ Monitoring Daemon"):
+        snapshot = MonitoringResultStore().load_latest()
+        if snapshot:
+            daemon_result = snapshot['result']
+            st.markdown(f"Tick {snapshot['tick']} published at {snapshot['published_at']}")
+            col1, col2, col3 = st.columns(3)
+            col1.metric("New Points", daemon_result['new_points'])
+            col2.metric("Series Updated", daemon_result['series_updated'])
+            # Older snapshots carry only the per-tick issues
+            active_issues = daemon_result.get('active_issues', daemon_result['top_issues'])
+            col3.metric("Active Issues", len(active_issues))
+            for issue in active_issues:
+                st.markdown(f"- **{issue['alert_id']}** ({issue['severity_score']:.1%}): {issue['reasoning']}")
+            for prediction in daemon_result['predictions']:
+                st.markdown(f"- 🔮 {prediction['metric_name']} on {prediction['resource']}: "
+                            f"{prediction['risk_level']} risk, {prediction['predicted_value']:.1f} predicted")
+        else:
+            st.info("Daemon not running. Start it with: python -m src.agents.monitoring_daemon")
+    
     # Performance metrics
     with st.expander("Agent Performance"):
         metrics = st.session_state.monitoring_agent.get_performance_metrics()
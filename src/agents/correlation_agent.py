@@ -3,18 +3,58 @@ Autonomous Incident Correlation Agent
 Independently analyzes, correlates, and groups incidents while making autonomous decisions
 """
 
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+import bisect
+import itertools
 import math
+import os
+import threading
+import time
 
-from ..models.incident import Incident, SeverityLevel
+import numpy as np
+
+from ..models.incident import Incident, SeverityLevel, IncidentStatus
 from ..models.correlation_result import CorrelationResult, CorrelationDecision, ConfidenceLevel
 from ..data.loader import DataLoader
+from ..data.correlation_store import CorrelationStore
+from ..data.action_sink import ActionSink
+from ..analytics.escalation_model import EscalationRiskModel, incident_features, escalation_labels
+
+# Technical terms with similarity weights (shared by exact scoring and storm grouping)
+TECHNICAL_TERMS = {
+    # High-weight terms (critical system components)
+    'database': 0.4, 'server': 0.4, 'network': 0.4, 'authentication': 0.4,
+    # Medium-weight terms (common issues)
+    'timeout': 0.3, 'connection': 0.3, 'slow': 0.3, 'error': 0.3, 'failure': 0.3,
+    'unavailable': 0.3, 'memory': 0.3, 'cpu': 0.3, 'disk': 0.3,
+    # Lower-weight terms (specific symptoms)
+    'email': 0.2, 'login': 0.2, 'backup': 0.2, 'storage': 0.2, 'application': 0.2,
+    'performance': 0.2, 'latency': 0.2, 'crash': 0.2, 'restart': 0.2
+}
+
+# Phrases that earn an extra similarity boost when both incidents mention them
+CORRELATION_PHRASES = [
+    'connection timeout', 'slow response', 'server error',
+    'database error', 'email delivery', 'login failed'
+]
+
+# Process-wide sequence so ids minted within the same second never collide
+_action_sequence = itertools.count(1)
+
+# Largest boost a pair can earn without sharing an affected system (user group + recency)
+MAX_CONTEXT_BOOST = 0.2
+
+# Slack on the cross-shard candidate bound, so pairs at the threshold up to float rounding are still scored
+CANDIDATE_BOUND_SLACK = 1e-9
 
 class AutonomousCorrelationAgent:
     """Agent that autonomously correlates incidents and makes grouping decisions"""
     
-    def __init__(self):
+    def __init__(self, storm_arrival_rate: float = 30.0, storm_queue_depth: int = 50,
+                 store_path: Optional[str] = None):
         # ITIL standards from steering guidelines (adjusted for demo)
         self.correlation_threshold = 0.4  # Lowered for demo to show more correlations
         self.high_confidence_threshold = 0.8  # >80% for autonomous action
@@ -38,6 +78,38 @@ class AutonomousCorrelationAgent:
             "load-balancer", "auth-service", "payment-gateway"
         ]
         
+        # Storm mode: coarse O(1) grouping while arrivals outpace exact scoring
+        self.storm_arrival_rate = storm_arrival_rate  # Incidents per minute to enter storm mode
+        self.storm_queue_depth = storm_queue_depth    # Pending incidents to enter storm mode
+        self.storm_exit_ratio = 0.5                   # Leave once load drops below 50% of the limits
+        self.storm_bucket_minutes = 15                # Time bucket width for coarse grouping
+        self.storm_check_seconds = 60.0               # Re-check load this often while in storm mode
+        self.storm_mode = False
+        self.mode_switches = []
+        self.storm_groups = {}
+        self.storm_incidents = []
+        self.reconciled_groups = []
+        self._arrival_times = deque()
+        self._arrival_clock_reference = None  # (latest arrival time, monotonic seconds when recorded)
+        self._queue_depth = 0
+        self._storm_open_queue = []
+        # Re-entrant: mode checks hold it while switching modes and starting reconciliation
+        self._storm_lock = threading.RLock()
+        self._storm_timer = None
+        self._reconciliation_thread = None
+        
+        # Optional on-disk correlation graph so restarts don't rescore incidents
+        self.correlation_store = CorrelationStore(store_path) if store_path else None
+        
+        # Offline-trained escalation model for ranking the whole queue
+        self.escalation_model = None
+        self.escalation_model_path = "data/escalation_model.json"
+        
+        # Correlated neighbours per incident, extended once per newly seen incident
+        self._neighbour_index = {}
+        self._neighbour_incidents = {}
+        self._neighbour_index_threshold = None
+        
     def initialize_model(self):
         """Initialize the text similarity model (using fallback for demo)"""
         # For hackathon demo, use keyword-based similarity
@@ -54,6 +126,11 @@ class AutonomousCorrelationAgent:
         # Use keyword-based similarity for hackathon demo
         similarity = self._keyword_similarity(text1, text2)
         
+        return self._context_similarity(incident1, incident2, similarity)
+    
+    def _context_similarity(self, incident1: Incident, incident2: Incident, similarity: float) -> float:
+        """Add the system, user-group and recency boosts to a keyword similarity"""
+        
         # Boost similarity for same affected system (ITIL best practice)
         if incident1.affected_system == incident2.affected_system:
             similarity += 0.2
@@ -74,20 +151,15 @@ class AutonomousCorrelationAgent:
     def _keyword_similarity(self, text1: str, text2: str) -> float:
         """Enhanced keyword-based similarity calculation for demo"""
         
-        # Enhanced technical terms with weights
-        technical_terms = {
-            # High-weight terms (critical system components)
-            'database': 0.4, 'server': 0.4, 'network': 0.4, 'authentication': 0.4,
-            # Medium-weight terms (common issues)
-            'timeout': 0.3, 'connection': 0.3, 'slow': 0.3, 'error': 0.3, 'failure': 0.3,
-            'unavailable': 0.3, 'memory': 0.3, 'cpu': 0.3, 'disk': 0.3,
-            # Lower-weight terms (specific symptoms)
-            'email': 0.2, 'login': 0.2, 'backup': 0.2, 'storage': 0.2, 'application': 0.2,
-            'performance': 0.2, 'latency': 0.2, 'crash': 0.2, 'restart': 0.2
-        }
-        
         words1 = set(word.lower() for word in text1.split())
         words2 = set(word.lower() for word in text2.split())
+        phrases1 = {phrase for phrase in CORRELATION_PHRASES if phrase in text1.lower()}
+        phrases2 = {phrase for phrase in CORRELATION_PHRASES if phrase in text2.lower()}
+        
+        return self._term_similarity(words1, words2, phrases1, phrases2)
+    
+    def _term_similarity(self, words1: set, words2: set, phrases1: set, phrases2: set) -> float:
+        """Keyword similarity from already tokenized texts and the correlation phrases they contain"""
         
         if not words1 or not words2:
             return 0.0
@@ -97,18 +169,15 @@ class AutonomousCorrelationAgent:
         union = words1.union(words2)
         base_similarity = len(intersection) / len(union) if union else 0.0
         
-        # Weighted boost for technical terms
+        # Weighted boost for technical terms (summed in sorted order, so the score is symmetric)
         tech_boost = 0.0
-        for word in words1.intersection(words2):
-            if word in technical_terms:
-                tech_boost += technical_terms[word]
+        for word in sorted(intersection & TECHNICAL_TERMS.keys()):
+            tech_boost += TECHNICAL_TERMS[word]
         
         base_similarity += tech_boost
         
         # Boost for exact phrase matches
-        if any(phrase in text1.lower() and phrase in text2.lower() 
-               for phrase in ['connection timeout', 'slow response', 'server error', 
-                            'database error', 'email delivery', 'login failed']):
+        if phrases1 & phrases2:
             base_similarity += 0.2
         
         return min(1.0, base_similarity)
@@ -119,13 +188,21 @@ class AutonomousCorrelationAgent:
         
         similar_incidents = []
         
+        # Reuse persisted scores and extend the graph with newly scored pairs
+        stored_scores = (self.correlation_store.get_incident_edges(target_incident.id)
+                         if self.correlation_store else {})
+        new_edges = []
+        
         for incident in existing_incidents:
             # Skip resolved/closed incidents and self
             if (incident.id == target_incident.id or 
                 incident.status.value in ['Resolved', 'Closed']):
                 continue
             
-            similarity_score = self.analyze_incident_similarity(target_incident, incident)
+            similarity_score = stored_scores.get(incident.id)
+            if similarity_score is None:
+                similarity_score = self.analyze_incident_similarity(target_incident, incident)
+                new_edges.append((target_incident.id, incident.id, similarity_score))
             
             if similarity_score >= self.correlation_threshold:
                 similar_incidents.append({
@@ -136,6 +213,9 @@ class AutonomousCorrelationAgent:
                     )
                 })
         
+        if self.correlation_store and new_edges:
+            self.correlation_store.add_edges(new_edges)
+        
         # Sort by similarity score (highest first)
         similar_incidents.sort(key=lambda x: x['similarity_score'], reverse=True)
         
@@ -317,7 +397,7 @@ class AutonomousCorrelationAgent:
         
         if result.decision == CorrelationDecision.GROUP_INCIDENTS:
             # Simulate grouping incidents
-            group_id = f"GRP-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            group_id = self._mint_action_id("GRP")
             action_result['details'] = {
                 'group_id': group_id,
                 'incidents_grouped': len(result.similar_incidents) + 1,
@@ -327,7 +407,7 @@ class AutonomousCorrelationAgent:
         
         elif result.decision == CorrelationDecision.CREATE_PROBLEM:
             # Simulate problem record creation
-            problem_id = f"PRB-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            problem_id = self._mint_action_id("PRB")
             action_result['details'] = {
                 'problem_id': problem_id,
                 'related_incidents': len(result.similar_incidents) + 1,
@@ -346,6 +426,107 @@ class AutonomousCorrelationAgent:
         
         return action_result
     
+    def execute_correlation_actions(self, results: List[CorrelationResult],
+                                    sink: Optional[ActionSink] = None) -> Dict:
+        """Execute many correlation decisions as one coalesced, transactional batch"""
+        
+        actionable = [result for result in results
+                      if result.decision != CorrelationDecision.NO_ACTION]
+        
+        # Coalesce overlapping groups so every incident lands in exactly one group
+        parent = {}
+        
+        def find(incident_id):
+            parent.setdefault(incident_id, incident_id)
+            while parent[incident_id] != incident_id:
+                parent[incident_id] = parent[parent[incident_id]]
+                incident_id = parent[incident_id]
+            return incident_id
+        
+        grouping_decisions = [CorrelationDecision.GROUP_INCIDENTS, CorrelationDecision.CREATE_PROBLEM]
+        escalations = {}
+        
+        for result in actionable:
+            if result.decision in grouping_decisions:
+                root = find(result.incident_id)
+                for incident_id in result.similar_incidents:
+                    other_root = find(incident_id)
+                    if other_root != root:
+                        parent[other_root] = root
+            elif result.decision == CorrelationDecision.ESCALATE_SEVERITY:
+                escalations.setdefault(result.incident_id, result)
+        
+        components = defaultdict(lambda: {'incident_ids': [], 'results': []})
+        for incident_id in parent:
+            components[find(incident_id)]['incident_ids'].append(incident_id)
+        for result in actionable:
+            if result.decision in grouping_decisions:
+                components[find(result.incident_id)]['results'].append(result)
+        
+        timestamp = datetime.now()
+        updates = []
+        
+        for component in components.values():
+            creates_problem = any(result.decision == CorrelationDecision.CREATE_PROBLEM
+                                  for result in component['results'])
+            details = {
+                'group_id': self._mint_action_id("GRP"),
+                'incidents_grouped': len(component['incident_ids']),
+                'max_correlation_score': max(result.correlation_score for result in component['results']),
+                'source_decisions': len(component['results'])
+            }
+            if creates_problem:
+                details['problem_id'] = self._mint_action_id("PRB")
+                details['assigned_team'] = 'Infrastructure Team'
+            
+            updates.append({
+                'update_id': details.get('problem_id', details['group_id']),
+                'action': (CorrelationDecision.CREATE_PROBLEM if creates_problem
+                           else CorrelationDecision.GROUP_INCIDENTS).value,
+                'incident_ids': component['incident_ids'],
+                'details': details,
+                'created_at': timestamp
+            })
+        
+        for incident_id, result in escalations.items():
+            updates.append({
+                'update_id': self._mint_action_id("ESC"),
+                'action': CorrelationDecision.ESCALATE_SEVERITY.value,
+                'incident_ids': [incident_id],
+                'details': {
+                    'escalation_reason': 'Multiple related high-severity incidents',
+                    'correlation_score': result.correlation_score
+                },
+                'created_at': timestamp
+            })
+        
+        # One transaction for the whole batch
+        if sink is not None and updates:
+            sink.apply(updates)
+        
+        groups_created = sum(1 for update in updates
+                             if update['action'] != CorrelationDecision.ESCALATE_SEVERITY.value)
+        problems_created = sum(1 for update in updates
+                               if update['action'] == CorrelationDecision.CREATE_PROBLEM.value)
+        
+        print(f"📦 Applied {len(updates)} updates from {len(actionable)} decisions "
+              f"({groups_created} groups, {problems_created} problems, {len(escalations)} escalations)")
+        
+        return {
+            'success': True,
+            'timestamp': timestamp,
+            'decisions_processed': len(actionable),
+            'groups_created': groups_created,
+            'problems_created': problems_created,
+            'escalations': len(escalations),
+            'incidents_grouped': len(parent),
+            'updates': updates
+        }
+    
+    def _mint_action_id(self, prefix: str) -> str:
+        """Mint a collision-free action id (timestamp plus process-wide sequence)"""
+        return f"{prefix}-{datetime.now().strftime('%Y%m%d%H%M%S%f')}-{next(_action_sequence):04d}"
+    
     def learn_from_feedback(self, result: CorrelationResult, feedback: Dict):
         """Learn from technician feedback to improve future decisions"""
         
@@ -379,19 +560,66 @@ class AutonomousCorrelationAgent:
         
         print("🔍 Correlation Agent: Running batch analysis...")
         
-        correlation_matrix = {}
-        incident_groups = []
+        incident_ids = [incident.id for incident in incidents]
+        
+        # Start from persisted scores so a warm restart doesn't rescore anything
+        if self.correlation_store:
+            correlation_matrix = self.correlation_store.load_correlation_matrix(incident_ids)
+        else:
+            correlation_matrix = {incident_id: {} for incident_id in incident_ids}
         
-        # Create correlation matrix
+        # Score only pairs missing from the matrix (similarity is symmetric)
+        new_edges = []
         for i, incident1 in enumerate(incidents):
-            correlation_matrix[incident1.id] = {}
-            
-            for j, incident2 in enumerate(incidents):
-                if i != j:
-                    similarity = self.analyze_incident_similarity(incident1, incident2)
-                    correlation_matrix[incident1.id][incident2.id] = similarity
+            for incident2 in incidents[i + 1:]:
+                if incident2.id in correlation_matrix[incident1.id]:
+                    continue
+                similarity = self.analyze_incident_similarity(incident1, incident2)
+                correlation_matrix[incident1.id][incident2.id] = similarity
+                correlation_matrix[incident2.id][incident1.id] = similarity
+                new_edges.append((incident1.id, incident2.id, similarity))
+        
+        if self.correlation_store and new_edges:
+            self.correlation_store.add_edges(new_edges)
+            print(f"💾 Persisted {len(new_edges)} new correlation edges")
+        
+        # Reuse stored groups when nothing changed since they were built
+        stored_groups = None
+        if self.correlation_store and not new_edges:
+            stored_groups = self.correlation_store.load_groups(self.correlation_threshold, incident_ids)
+        
+        if stored_groups is not None:
+            incidents_by_id = {incident.id: incident for incident in incidents}
+            incident_groups = [{
+                'group_id': group['group_id'],
+                'incidents': [incidents_by_id[incident_id] for incident_id in group['incident_ids']],
+                'size': len(group['incident_ids']),
+                'avg_similarity': group['avg_similarity']
+            } for group in stored_groups]
+        else:
+            incident_groups = self._cluster_incidents(incidents, correlation_matrix)
+            if self.correlation_store:
+                self.correlation_store.save_groups(
+                    [{'group_id': group['group_id'],
+                      'incident_ids': [incident.id for incident in group['incidents']],
+                      'avg_similarity': group['avg_similarity']} for group in incident_groups],
+                    self.correlation_threshold, incident_ids
+                )
+        
+        return {
+            'correlation_matrix': correlation_matrix,
+            'incident_groups': incident_groups,
+            'total_incidents': len(incidents),
+            'grouped_incidents': sum(len(group['incidents']) for group in incident_groups),
+            'ungrouped_incidents': len(incidents) - sum(len(group['incidents']) for group in incident_groups),
+            'newly_scored_pairs': len(new_edges)
+        }
+    
+    def _cluster_incidents(self, incidents: List[Incident], 
+                           correlation_matrix: Dict[str, Dict[str, float]]) -> List[Dict]:
+        """Find incident clusters using similarity threshold"""
         
-        # Find incident clusters using similarity threshold
+        incident_groups = []
         processed_incidents = set()
         
         for incident in incidents:
@@ -416,14 +644,192 @@ class AutonomousCorrelationAgent:
                     'avg_similarity': sum(correlation_matrix[group[0].id].get(inc.id, 0) for inc in group[1:]) / max(1, len(group)-1)
                 })
         
+        return incident_groups
+    
+    def sharded_correlation_analysis(self, incidents: List[Incident],
+                                     service_groups: Optional[Dict[str, str]] = None,
+                                     max_workers: Optional[int] = None) -> Dict:
+        """Correlate incidents in per-system shards across worker processes"""
+        
+        print("🧩 Correlation Agent: Running sharded analysis...")
+        
+        # Partition by service group when configured, otherwise by affected system
+        service_groups = service_groups or {}
+        shards = defaultdict(list)
+        for incident in incidents:
+            shards[service_groups.get(incident.affected_system, incident.affected_system)].append(incident)
+        
+        shard_jobs = [(shard_key, shard_incidents, self.correlation_threshold)
+                      for shard_key, shard_incidents in shards.items()]
+        
+        if max_workers == 1 or len(shard_jobs) <= 1:
+            shard_results = [_analyze_shard(*job) for job in shard_jobs]
+            cross_edges, candidates = self._cross_shard_edges(incidents, shard_results)
+        else:
+            workers = max_workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                shard_results = list(executor.map(_analyze_shard, *zip(*shard_jobs)))
+                # The cross-shard pass is split across the same pool
+                cross_edges, candidates = self._cross_shard_edges(incidents, shard_results, executor, workers)
+        
+        strong_edges = []
+        for shard_result in shard_results:
+            strong_edges.extend(shard_result['edges'])
+        strong_edges.extend(cross_edges)
+        
+        incident_groups = self._merge_shard_groups(incidents, shard_results, strong_edges)
+        grouped = sum(group['size'] for group in incident_groups)
+        
+        print(f"🔗 {len(shard_results)} shards, {len(cross_edges)} cross-shard links "
+              f"from {candidates} candidate pairs")
+        
         return {
-            'correlation_matrix': correlation_matrix,
+            'mode': 'sharded',
+            'shards': {result['shard_key']: {'incidents': len(result['incident_ids']),
+                                             'groups': len(result['incident_groups'])}
+                       for result in shard_results},
+            'correlation_edges': strong_edges,
+            'cross_shard_edges': len(cross_edges),
+            'cross_shard_candidates': candidates,
             'incident_groups': incident_groups,
             'total_incidents': len(incidents),
-            'grouped_incidents': sum(len(group['incidents']) for group in incident_groups),
-            'ungrouped_incidents': len(incidents) - sum(len(group['incidents']) for group in incident_groups)
+            'grouped_incidents': grouped,
+            'ungrouped_incidents': len(incidents) - grouped
         }
     
+    def _cross_shard_edges(self, incidents: List[Incident], shard_results: List[Dict],
+                           executor: Optional[ProcessPoolExecutor] = None,
+                           workers: int = 1) -> Tuple[List[Tuple[str, str, float]], int]:
+        """Score only cross-shard pairs that can still pass without the same-system boost
+
+        A pair's keyword score is Jaccard + shared technical-term weights + a shared-phrase boost,
+        so it can only reach the bar if the incidents share a technical term or phrase, or their
+        Jaccard alone reaches it. The last case is found with a prefix filter: with tokens in a
+        global rarest-first order, two sets with Jaccard >= t always share one of their first
+        |x| - ceil(t * |x|) + 1 tokens, so common words are never used to pair incidents up.
+        Candidates are then scored with the same helpers as analyze_incident_similarity.
+        """
+        
+        min_keyword_score = self.correlation_threshold - MAX_CONTEXT_BOOST - CANDIDATE_BOUND_SLACK
+        incidents_by_id = {incident.id: incident for incident in incidents}
+        
+        incident_ids = []
+        shard_of = []
+        token_sets = []
+        for shard_index, shard_result in enumerate(shard_results):
+            for incident_id in shard_result['incident_ids']:
+                incident_ids.append(incident_id)
+                shard_of.append(shard_index)
+                token_sets.append(frozenset(shard_result['tokens'][incident_id]))
+        
+        document_frequency = defaultdict(int)
+        for tokens in token_sets:
+            for token in tokens:
+                document_frequency[token] += 1
+        
+        # Postings hold ascending positions, so each pair is generated once (from its lower position)
+        postings = defaultdict(list)
+        for position, tokens in enumerate(token_sets):
+            index_tokens = {token for token in tokens if token in TECHNICAL_TERMS}
+            if min_keyword_score > 0 and tokens:
+                ordered = sorted(tokens, key=lambda token: (document_frequency[token], token))
+                index_tokens.update(ordered[:len(tokens) - math.ceil(min_keyword_score * len(tokens)) + 1])
+            for token in index_tokens:
+                postings[token].append(position)
+        
+        phrases = []
+        for position, incident_id in enumerate(incident_ids):
+            incident_phrases = shard_results[shard_of[position]]['phrases'][incident_id]
+            phrases.append(incident_phrases)
+            for phrase in incident_phrases:
+                postings[f"phrase:{phrase}"].append(position)
+        
+        index = {
+            'shard_of': shard_of,
+            'incidents': [incidents_by_id[incident_id] for incident_id in incident_ids],
+            'token_sets': token_sets,
+            'phrases': phrases,
+            'index_keys': [[key for key in tokens if key in postings] +
+                           [f"phrase:{phrase}" for phrase in incident_phrases]
+                           for tokens, incident_phrases in zip(token_sets, phrases)],
+            'postings': dict(postings),
+            # Context boosts alone can pass a low threshold, so every pair is a candidate then
+            'all_pairs': min_keyword_score <= 0
+        }
+        
+        # Interleaved anchor slices balance the work (low positions have the most pairs to check)
+        slices = max(1, workers * 4) if executor is not None else 1
+        anchor_slices = [range(offset, len(incident_ids), slices) for offset in range(slices)]
+        if executor is not None:
+            jobs = [executor.submit(_score_cross_shard_pairs, anchors, index, self.correlation_threshold)
+                    for anchors in anchor_slices]
+            results = [job.result() for job in jobs]
+        else:
+            results = [_score_cross_shard_pairs(anchors, index, self.correlation_threshold, self)
+                       for anchors in anchor_slices]
+        
+        edges = []
+        candidates = 0
+        for slice_edges, slice_candidates in results:
+            candidates += slice_candidates
+            for position1, position2, similarity in slice_edges:
+                id1, id2 = incident_ids[position1], incident_ids[position2]
+                edges.append((id1, id2, similarity) if id1 < id2 else (id2, id1, similarity))
+        
+        return edges, candidates
+    
+    def _merge_shard_groups(self, incidents: List[Incident], shard_results: List[Dict],
+                            strong_edges: List[Tuple[str, str, float]]) -> List[Dict]:
+        """Join shard clusters that are linked by cross-shard correlations"""
+        
+        parent = {incident.id: incident.id for incident in incidents}
+        
+        def find(incident_id):
+            while parent[incident_id] != incident_id:
+                parent[incident_id] = parent[parent[incident_id]]
+                incident_id = parent[incident_id]
+            return incident_id
+        
+        def union(id1, id2):
+            root1, root2 = find(id1), find(id2)
+            if root1 != root2:
+                parent[root2] = root1
+        
+        for shard_result in shard_results:
+            for group in shard_result['incident_groups']:
+                for incident_id in group['incident_ids'][1:]:
+                    union(group['incident_ids'][0], incident_id)
+        
+        # Only cross-shard links merge clusters; in-shard edges are already clustered
+        shard_of = {incident_id: result['shard_key']
+                    for result in shard_results for incident_id in result['incident_ids']}
+        for id1, id2, _ in strong_edges:
+            if shard_of[id1] != shard_of[id2]:
+                union(id1, id2)
+        
+        members = defaultdict(list)
+        for incident in incidents:
+            members[find(incident.id)].append(incident)
+        
+        edge_scores = defaultdict(list)
+        for id1, id2, score in strong_edges:
+            root = find(id1)
+            if root == find(id2):
+                edge_scores[root].append(score)
+        
+        incident_groups = []
+        for root, group in members.items():
+            if len(group) > 1:
+                scores = edge_scores[root]
+                incident_groups.append({
+                    'group_id': f"GRP-{len(incident_groups)+1}",
+                    'incidents': group,
+                    'size': len(group),
+                    'avg_similarity': sum(scores) / len(scores) if scores else 0.0
+                })
+        
+        return incident_groups
+    
     def predict_incident_escalation(self, incident: Incident, similar_incidents: List[Dict]) -> Dict:
         """Predict if incident is likely to escalate based on historical patterns"""
         
@@ -469,12 +875,423 @@ class AutonomousCorrelationAgent:
             'total_similar': total_similar
         }
     
+    def train_escalation_model(self, historical_incidents: Optional[List[Incident]] = None,
+                               model_path: Optional[str] = None) -> Dict:
+        """Train the escalation model on incidents whose SLA outcome is known"""
+        
+        incidents = historical_incidents if historical_incidents is not None else self.data_loader.load_incidents()
+        
+        labels = escalation_labels(incidents)
+        known = ~np.isnan(labels)
+        ratios = self._neighbour_escalation_ratios(incidents, incidents)
+        features = incident_features(incidents, ratios, self.critical_systems)
+        
+        model = EscalationRiskModel()
+        summary = model.fit(features[known], labels[known])
+        self.escalation_model = model
+        
+        if model_path:
+            model.save(model_path)
+        
+        print(f"🧠 Correlation Agent: Escalation model trained on {summary['samples']} incidents")
+        return summary
+    
+    def rank_escalation_risk(self, open_incidents: Optional[List[Incident]] = None,
+                             all_incidents: Optional[List[Incident]] = None) -> List[Dict]:
+        """Score every open incident for escalation risk in one pass, highest risk first"""
+        
+        all_incidents = all_incidents if all_incidents is not None else self.data_loader.load_incidents()
+        if open_incidents is None:
+            open_incidents = [incident for incident in all_incidents
+                              if incident.status not in [IncidentStatus.RESOLVED, IncidentStatus.CLOSED]]
+        if not open_incidents:
+            return []
+        
+        if self.escalation_model is None:
+            if os.path.exists(self.escalation_model_path):
+                self.escalation_model = EscalationRiskModel.load(self.escalation_model_path)
+            else:
+                self.train_escalation_model(all_incidents)
+        
+        ratios = self._neighbour_escalation_ratios(open_incidents, all_incidents)
+        probabilities = self.escalation_model.predict_proba(
+            incident_features(open_incidents, ratios, self.critical_systems)
+        )
+        
+        order = np.argsort(-probabilities, kind='stable')
+        return [{
+            'rank': rank,
+            'incident_id': open_incidents[index].id,
+            'title': open_incidents[index].title,
+            'severity': open_incidents[index].severity.value,
+            'affected_system': open_incidents[index].affected_system,
+            'neighbour_escalation_ratio': float(ratios[index]),
+            'escalation_probability': float(probabilities[index])
+        } for rank, index in enumerate(order, 1)]
+    
+    def _neighbour_escalation_ratios(self, incidents: List[Incident],
+                                     reference_incidents: List[Incident]) -> np.ndarray:
+        """Share of each incident's correlated neighbours (within the reference set) that were P1/P2"""
+        
+        if not incidents:
+            return np.zeros(0)
+        
+        self._update_neighbour_index(list(reference_incidents) + list(incidents))
+        
+        # Severities are read fresh each call, so neighbours that escalated later count
+        escalated = {incident.id: incident.severity in [SeverityLevel.P1, SeverityLevel.P2]
+                     for incident in itertools.chain(reference_incidents, incidents)}
+        ratios = np.zeros(len(incidents))
+        for i, incident in enumerate(incidents):
+            neighbours = [neighbour_id for neighbour_id in self._neighbour_index[incident.id]
+                          if neighbour_id in escalated]
+            if neighbours:
+                ratios[i] = sum(escalated[neighbour_id] for neighbour_id in neighbours) / len(neighbours)
+        return ratios
+    
+    def _update_neighbour_index(self, incidents: List[Incident]):
+        """Score each incident not seen before against the indexed ones (once per arrival)"""
+        
+        if self._neighbour_index_threshold != self.correlation_threshold:
+            self._neighbour_index = {}
+            self._neighbour_incidents = {}
+            self._neighbour_index_threshold = self.correlation_threshold
+        
+        new_edges = []
+        for incident in incidents:
+            if incident.id in self._neighbour_incidents:
+                continue
+            
+            # Persisted scores are reused; only pairs never scored before are computed
+            stored_scores = (self.correlation_store.get_incident_edges(incident.id)
+                             if self.correlation_store else {})
+            neighbours = self._neighbour_index[incident.id] = set()
+            for other_id, other in self._neighbour_incidents.items():
+                similarity = stored_scores.get(other_id)
+                if similarity is None:
+                    similarity = self.analyze_incident_similarity(incident, other)
+                    new_edges.append((incident.id, other_id, similarity))
+                if similarity >= self.correlation_threshold:
+                    neighbours.add(other_id)
+                    self._neighbour_index[other_id].add(incident.id)
+            self._neighbour_incidents[incident.id] = incident
+        
+        if self.correlation_store and new_edges:
+            self.correlation_store.add_edges(new_edges)
+    
+    def correlate_incoming_incident(self, incident: Incident, existing_incidents: List[Incident],
+                                    queue_depth: int = 0,
+                                    arrival_time: Optional[datetime] = None) -> Dict:
+        """Correlate a newly arrived incident, falling back to coarse grouping under storm load"""
+        
+        self._record_arrival(arrival_time or datetime.now())
+        self.update_load_mode(queue_depth, arrival_time)
+        
+        if self.storm_mode:
+            # Latest view of the open queue, for reconciling storm incidents once load drops
+            self._storm_open_queue = existing_incidents
+            return self._storm_group_incident(incident)
+        
+        similar_incidents = self.find_similar_incidents(incident, existing_incidents)
+        result = self.make_correlation_decision(incident, similar_incidents)
+        
+        return {
+            'mode': 'exact',
+            'incident_id': incident.id,
+            'group_id': None,
+            'result': result,
+            'similar_incidents': similar_incidents
+        }
+    
+    def update_load_mode(self, queue_depth: Optional[int] = None, now: Optional[datetime] = None) -> bool:
+        """Re-evaluate load and switch between exact and storm mode (returns storm state)
+        
+        Call with the current queue depth when the queue drains; without one the last reported depth is used.
+        Without `now`, time is measured on the clock of the recorded arrivals.
+        """
+        
+        # Arrivals, the storm timer and metrics polling can all get here; check and switch atomically
+        with self._storm_lock:
+            now = now or self._arrival_clock()
+            if queue_depth is None:
+                queue_depth = self._queue_depth
+            self._queue_depth = queue_depth
+            
+            # Arrival rate over a sliding one-minute window
+            window_start = now - timedelta(minutes=1)
+            while self._arrival_times and self._arrival_times[0] < window_start:
+                self._arrival_times.popleft()
+            arrival_rate = len(self._arrival_times)
+            
+            if not self.storm_mode:
+                if arrival_rate >= self.storm_arrival_rate or queue_depth >= self.storm_queue_depth:
+                    self._switch_mode(True, now, arrival_rate, queue_depth)
+            elif (arrival_rate < self.storm_arrival_rate * self.storm_exit_ratio and
+                  queue_depth < self.storm_queue_depth * self.storm_exit_ratio):
+                self._switch_mode(False, now, arrival_rate, queue_depth)
+                self._start_reconciliation()
+            
+            return self.storm_mode
+    
+    def wait_for_reconciliation(self, timeout: Optional[float] = None) -> bool:
+        """Block until background reconciliation finishes (returns True when idle)"""
+        thread = self._reconciliation_thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+    
+    def _record_arrival(self, arrival_time: datetime):
+        """Track incident arrival for load-aware mode selection"""
+        with self._storm_lock:
+            self._arrival_times.append(arrival_time)
+            reference = self._arrival_clock_reference
+            if reference is None or arrival_time >= reference[0]:
+                self._arrival_clock_reference = (arrival_time, time.monotonic())
+    
+    def _arrival_clock(self) -> datetime:
+        """Current time on the arrivals' clock: the latest arrival plus the time elapsed since it"""
+        if self._arrival_clock_reference is None:
+            return datetime.now()
+        arrival_time, recorded_at = self._arrival_clock_reference
+        return arrival_time + timedelta(seconds=time.monotonic() - recorded_at)
+    
+    def _switch_mode(self, storm: bool, now: datetime, arrival_rate: int, queue_depth: int):
+        """Record a switch between exact and storm correlation modes"""
+        
+        self.storm_mode = storm
+        self.mode_switches.append({
+            'timestamp': now,
+            'from_mode': 'exact' if storm else 'storm',
+            'to_mode': 'storm' if storm else 'exact',
+            'arrival_rate': arrival_rate,
+            'queue_depth': queue_depth
+        })
+        
+        if storm:
+            print(f"🌩️ Correlation Agent: Storm mode engaged ({arrival_rate}/min, queue {queue_depth})")
+            self._schedule_storm_check()
+        else:
+            print(f"🌤️ Correlation Agent: Load normalized ({arrival_rate}/min) - resuming exact scoring")
+    
+    def _schedule_storm_check(self):
+        """Re-evaluate load on a timer so storm mode ends even when no further incidents arrive"""
+        with self._storm_lock:
+            if self._storm_timer is not None:
+                self._storm_timer.cancel()
+            self._storm_timer = threading.Timer(self.storm_check_seconds, self._check_storm_exit)
+            self._storm_timer.daemon = True
+            self._storm_timer.start()
+    
+    def _check_storm_exit(self):
+        """Timer callback: leave storm mode once load has dropped, otherwise check again later"""
+        with self._storm_lock:
+            # A timer superseded by a newer one (or outliving its storm) does nothing
+            if self._storm_timer is not threading.current_thread() or not self.storm_mode:
+                return
+            if self.update_load_mode():
+                self._schedule_storm_check()
+    
+    def _storm_group_key(self, incident: Incident) -> Tuple[str, int, str]:
+        """Coarse grouping key: (affected system, time bucket, top symptom)"""
+        bucket = int(incident.created_at.timestamp() // (self.storm_bucket_minutes * 60))
+        return (incident.affected_system, bucket, self._top_symptom(incident))
+    
+    def _top_symptom(self, incident: Incident) -> str:
+        """Highest-weighted technical term mentioned by the incident"""
+        words = set(f"{incident.title} {incident.description}".lower().split())
+        symptoms = [word for word in words if word in TECHNICAL_TERMS]
+        if not symptoms:
+            return "unclassified"
+        return max(symptoms, key=lambda word: (TECHNICAL_TERMS[word], word))
+    
+    def _storm_group_incident(self, incident: Incident) -> Dict:
+        """Assign an incident to its coarse storm group in O(1)"""
+        
+        key = self._storm_group_key(incident)
+        
+        with self._storm_lock:
+            group = self.storm_groups.get(key)
+            if group is None:
+                group = {
+                    'group_id': f"GRP-STORM-{len(self.storm_groups) + 1}",
+                    'group_key': key,
+                    'incidents': []
+                }
+                self.storm_groups[key] = group
+            group['incidents'].append(incident)
+            self.storm_incidents.append(incident)
+        
+        return {
+            'mode': 'storm',
+            'incident_id': incident.id,
+            'group_id': group['group_id'],
+            'group_key': key,
+            'group_size': len(group['incidents']),
+            'result': None,
+            'similar_incidents': []
+        }
+    
+    def _start_reconciliation(self):
+        """Hand incidents grouped during the storm to a background exact-scoring pass"""
+        
+        with self._storm_lock:
+            incidents = self.storm_incidents
+            open_queue = self._storm_open_queue
+            self.storm_incidents = []
+            self.storm_groups = {}
+            self._storm_open_queue = []
+            
+            if not incidents:
+                return
+            
+            # A previous storm's reconciliation may still be running; this one queues behind it
+            self._reconciliation_thread = threading.Thread(
+                target=self._reconcile_storm_incidents,
+                args=(incidents, open_queue, self._reconciliation_thread), daemon=True
+            )
+            self._reconciliation_thread.start()
+    
+    def _reconcile_storm_incidents(self, incidents: List[Incident], open_queue: List[Incident],
+                                   previous: Optional[threading.Thread] = None):
+        """Re-score storm-grouped incidents with exact similarity, against each other and the open queue"""
+        
+        if previous is not None:
+            previous.join()
+        
+        storm_ids = {incident.id for incident in incidents}
+        queued = [incident for incident in open_queue if incident.id not in storm_ids]
+        candidates = incidents + queued
+        
+        if self.correlation_store:
+            correlation_matrix = self.correlation_store.load_correlation_matrix(
+                [incident.id for incident in candidates])
+        else:
+            correlation_matrix = {incident.id: {} for incident in candidates}
+        
+        # Queue pairs were scored before the storm; only pairs involving a storm incident are new
+        new_edges = []
+        for i, incident1 in enumerate(incidents):
+            for incident2 in candidates[i + 1:]:
+                if incident2.id in correlation_matrix[incident1.id]:
+                    continue
+                similarity = self.analyze_incident_similarity(incident1, incident2)
+                correlation_matrix[incident1.id][incident2.id] = similarity
+                correlation_matrix[incident2.id][incident1.id] = similarity
+                new_edges.append((incident1.id, incident2.id, similarity))
+        
+        if self.correlation_store and new_edges:
+            self.correlation_store.add_edges(new_edges)
+        
+        # Storm incidents come first so they anchor the groups; pre-storm queue groups are dropped
+        groups = [group for group in self._cluster_incidents(candidates, correlation_matrix)
+                  if any(incident.id in storm_ids for incident in group['incidents'])]
+        
+        with self._storm_lock:
+            self.reconciled_groups.extend(groups)
+    
     def get_performance_metrics(self) -> Dict:
         """Get agent performance metrics for monitoring"""
-        return {
+        
+        # Polling metrics also lets storm mode end once arrivals stop
+        if self.storm_mode:
+            self.update_load_mode()
+        
+        metrics = {
             'decisions_made': len(self.decisions_made),
             'accuracy_score': self.accuracy_score,
             'correlation_threshold': self.correlation_threshold,
             'autonomous_actions': sum(1 for d in self.decisions_made if d.auto_executed),
-            'feedback_received': len(self.feedback_history)
-        }
\ No newline at end of file
+            'feedback_received': len(self.feedback_history),
+            'storm_mode': self.storm_mode,
+            'mode_switches': len(self.mode_switches),
+            'last_mode_switch': self.mode_switches[-1] if self.mode_switches else None,
+            'storm_grouped_incidents': len(self.storm_incidents),
+            'reconciled_groups': len(self.reconciled_groups),
+            'reconciliation_pending': not self.wait_for_reconciliation(timeout=0)
+        }
+        
+        if self.correlation_store:
+            metrics.update(self.correlation_store.get_stats())
+        
+        return metrics
+
+def _analyze_shard(shard_key: str, incidents: List[Incident], correlation_threshold: float) -> Dict:
+    """Worker-process entry point: correlate one shard and build its token index"""
+    
+    agent = AutonomousCorrelationAgent()
+    agent.correlation_threshold = correlation_threshold
+    
+    correlation_matrix = {incident.id: {} for incident in incidents}
+    edges = []
+    for i, incident1 in enumerate(incidents):
+        for incident2 in incidents[i + 1:]:
+            similarity = agent.analyze_incident_similarity(incident1, incident2)
+            correlation_matrix[incident1.id][incident2.id] = similarity
+            correlation_matrix[incident2.id][incident1.id] = similarity
+            if similarity >= correlation_threshold:
+                edges.append((incident1.id, incident2.id, similarity))
+    
+    incident_groups = [{
+        'group_id': group['group_id'],
+        'incident_ids': [incident.id for incident in group['incidents']],
+        'avg_similarity': group['avg_similarity']
+    } for group in agent._cluster_incidents(incidents, correlation_matrix)]
+    
+    # Token and phrase sets used by the cross-shard candidate pass
+    tokens = {}
+    phrases = {}
+    for incident in incidents:
+        text = f"{incident.title} {incident.description}"
+        tokens[incident.id] = list(set(word.lower() for word in text.split()))
+        phrases[incident.id] = {phrase for phrase in CORRELATION_PHRASES if phrase in text.lower()}
+    
+    return {
+        'shard_key': shard_key,
+        'incident_ids': [incident.id for incident in incidents],
+        'incident_groups': incident_groups,
+        'edges': edges,
+        'tokens': tokens,
+        'phrases': phrases
+    }
+
+def _score_cross_shard_pairs(anchors, index: Dict, correlation_threshold: float,
+                             agent: Optional[AutonomousCorrelationAgent] = None
+                             ) -> Tuple[List[Tuple[int, int, float]], int]:
+    """Worker-process entry point: score the cross-shard candidates of some anchor incidents
+
+    Pairs are (anchor, later position); returns the passing edges by position and the candidate count.
+    """
+    
+    agent = agent or AutonomousCorrelationAgent()
+    shard_of = index['shard_of']
+    incidents = index['incidents']
+    token_sets = index['token_sets']
+    phrases = index['phrases']
+    postings = index['postings']
+    everything = range(len(shard_of))
+    
+    edges = []
+    candidates = 0
+    for position1 in anchors:
+        if index['all_pairs']:
+            found = everything[position1 + 1:]
+        else:
+            found = set()
+            for key in index['index_keys'][position1]:
+                posting = postings[key]
+                found.update(posting[bisect.bisect_right(posting, position1):])
+        
+        for position2 in found:
+            if shard_of[position2] == shard_of[position1]:
+                continue
+            candidates += 1
+            
+            # Same helpers as analyze_incident_similarity (on pre-tokenized text), so results match bit for bit
+            keyword_score = agent._term_similarity(token_sets[position1], token_sets[position2],
+                                                   phrases[position1], phrases[position2])
+            similarity = agent._context_similarity(incidents[position1], incidents[position2], keyword_score)
+            if similarity >= correlation_threshold:
+                edges.append((position1, position2, similarity))
+    
+    return edges, candidates
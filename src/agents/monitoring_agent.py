@@ -3,14 +3,105 @@ Autonomous Proactive Monitoring Agent
 Independently monitors infrastructure, predicts issues, and takes preventive actions
 """
 
-import statistics
+import json
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Union
+from dataclasses import dataclass, field
+
+import numpy as np
 
 from ..models.alert import Alert, AlertSeverity, AlertStatus
 from ..models.correlation_result import MonitoringResult, ConfidenceLevel
 from ..data.loader import DataLoader
+from ..data.metric_store import (MetricStore, PreparedMetrics, MICROS_PER_HOUR, from_epoch_micros,
+                                 parse_timestamps)
+from ..data.rollups import SeriesRollups
+from ..data.alert_cache import AlertCache
+from ..data.analysis_cache import AnalysisCache
+from ..analytics.rolling_stats import RunningStats
+from ..analytics.regression import batched_trend_projection
+from ..analytics.forecasting import HoltWintersForecaster
+from ..analytics.quantiles import QuantileSketch, merge_sketches
+from ..analytics.capacity import capacity_metrics, capacity_table
+from ..analytics.periodicity import detect_spike_periods
+from ..analytics.change_points import CusumDetector
+from ..analytics.comovement import align_series, lagged_correlations, comoving_groups
+from ..analytics.ranking import top_n_indices
+
+# Scale factor making MAD a consistent estimator of the standard deviation for normal data
+MAD_TO_STDEV = 1.4826
+
+# Anything the analysis stages accept: raw JSON layout, columnar store or prepared series
+MetricsInput = Union[Dict, MetricStore, PreparedMetrics]
+
+# Points kept per series for trend analysis and short-range extrapolation
+RECENT_POINTS = 10
+TREND_POINTS = 5
+
+# Unreported change points kept per series between runs
+PENDING_CHANGE_POINTS = 10
+
+# Rollup buckets requested per series when correlating metrics on one resource
+COMOVEMENT_MIN_BUCKETS = 60
+
+# Issues reported per run
+TOP_ISSUE_COUNT = 3
+
+# Alert threshold per metric type (anything else uses DEFAULT_METRIC_THRESHOLD)
+METRIC_THRESHOLDS = {
+    'cpu_utilization': 85.0,
+    'memory_usage': 90.0,
+    'disk_usage': 85.0,
+    'network_throughput': 80.0,
+    'error_rate': 5.0,
+    'response_time': 2000.0  # milliseconds
+}
+DEFAULT_METRIC_THRESHOLD = 80.0
+
+# Prediction text per metric type and trend
+TREND_PREDICTIONS = {
+    'cpu_utilization': {
+        'increasing': "CPU usage trending upward - potential performance degradation",
+        'decreasing': "CPU usage normalizing - system recovering",
+        'stable': "CPU usage stable within normal range"
+    },
+    'memory_usage': {
+        'increasing': "Memory usage climbing - possible memory leak detected",
+        'decreasing': "Memory usage decreasing - system optimization effective",
+        'stable': "Memory usage stable - no immediate concerns"
+    },
+    'disk_usage': {
+        'increasing': "Disk space consumption accelerating - storage cleanup needed",
+        'decreasing': "Disk usage optimized - cleanup activities successful",
+        'stable': "Disk usage stable - adequate storage available"
+    }
+}
+
+# Recommended actions per metric type (callers copy before adding urgency items)
+RECOMMENDED_ACTIONS = {
+    'cpu_utilization': [
+        "Check for runaway processes using top/htop",
+        "Review recent deployments for performance issues",
+        "Consider scaling up server resources",
+        "Investigate high CPU consuming applications"
+    ],
+    'memory_usage': [
+        "Investigate potential memory leaks in applications",
+        "Restart services with high memory consumption",
+        "Review application logs for memory-related errors",
+        "Consider increasing available memory"
+    ],
+    'disk_usage': [
+        "Clean up temporary files and logs",
+        "Archive old data to secondary storage",
+        "Review disk usage by directory (du -sh /*)",
+        "Plan for additional storage capacity"
+    ]
+}
 
 @dataclass
 class MetricAnalysis:
@@ -23,13 +114,64 @@ class MetricAnalysis:
     trend: str  # "increasing", "decreasing", "stable"
     prediction: str
     confidence: float
+    resource: str = ""
+
+@dataclass
+class SeriesState:
+    """Incremental per-series state so every point is processed exactly once"""
+    stats: RunningStats
+    recent_values: deque = field(default_factory=lambda: deque(maxlen=RECENT_POINTS))
+    first_timestamp: Optional[int] = None
+    last_timestamp: Optional[int] = None
+    points_seen: int = 0
+    forecaster: HoltWintersForecaster = field(default_factory=HoltWintersForecaster)
+    rollups: SeriesRollups = field(default_factory=SeriesRollups)
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+    change_detector: CusumDetector = field(default_factory=CusumDetector)
+    change_points: deque = field(default_factory=lambda: deque(maxlen=PENDING_CHANGE_POINTS))
+    
+    def to_dict(self) -> Dict:
+        """Serialize state for persistence between runs"""
+        return {
+            'stats': self.stats.to_dict(),
+            'recent_values': list(self.recent_values),
+            'first_timestamp': self.first_timestamp,
+            'last_timestamp': self.last_timestamp,
+            'points_seen': self.points_seen,
+            'forecaster': self.forecaster.to_dict(),
+            'rollups': self.rollups.to_dict(),
+            'sketch': self.sketch.to_dict(),
+            'change_detector': self.change_detector.to_dict(),
+            'change_points': list(self.change_points)
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SeriesState':
+        """Restore state saved by to_dict"""
+        return cls(
+            stats=RunningStats.from_dict(data['stats']),
+            recent_values=deque(data['recent_values'], maxlen=RECENT_POINTS),
+            first_timestamp=data['first_timestamp'],
+            last_timestamp=data['last_timestamp'],
+            points_seen=data['points_seen'],
+            forecaster=HoltWintersForecaster.from_dict(data['forecaster']),
+            rollups=SeriesRollups.from_dict(data['rollups']) if 'rollups' in data else SeriesRollups(),
+            sketch=QuantileSketch.from_dict(data['sketch']) if 'sketch' in data else QuantileSketch(),
+            change_detector=(CusumDetector.from_dict(data['change_detector'])
+                             if 'change_detector' in data else CusumDetector()),
+            change_points=deque(data.get('change_points', []), maxlen=PENDING_CHANGE_POINTS)
+        )
 
 class AutonomousMonitoringAgent:
     """Agent that autonomously monitors infrastructure and makes proactive decisions"""
     
-    def __init__(self):
+    def __init__(self, state_path: Optional[str] = None):
         # ITIL Service Operation standards from steering guidelines
         self.anomaly_threshold = 2.0  # Standard deviations for anomaly detection
+        
+        # "zscore" (mean/stdev), "mad" (median/MAD) or "percentile" (outside percentile_band)
+        self.anomaly_detection_mode = "zscore"
+        self.percentile_band = (0.01, 0.99)
         self.critical_threshold = 0.9  # 90% threshold for critical alerts
         self.warning_threshold = 0.8   # 80% threshold for warning alerts
         
@@ -48,69 +190,120 @@ class AutonomousMonitoringAgent:
         self.top_issues = []
         self.performance_history = []
         
+        # Active alerts by (metric, resource, severity band) so repeats don't fan out new actions
+        self.alert_cache = AlertCache()
+        
+        # Latest issue per (metric, resource) until a fresh analysis of that series recovers
+        self.active_issues: Dict[Tuple[str, str], MonitoringResult] = {}
+        
+        # Analyses of series that haven't changed since they were last analyzed
+        self.analysis_cache = AnalysisCache()
+        
+        # Anomalies on one resource whose recent history correlates (at any lag up to
+        # comovement_max_lag grid steps) are reported as a single issue
+        self.comovement_hours = 24
+        self.comovement_max_lag = 6
+        self.comovement_min_correlation = 0.7
+        
         # Learning and adaptation
         self.false_positive_rate = 0.0
         self.accuracy_score = 0.0
         
+        # Incremental statistics per series (None = whole history, else last N points)
+        self.stats_window = None
+        self.series_state = {}
+        
+        # Retention per rollup tier in seconds ('1m', '1h', '1d'); None keeps the defaults
+        self.rollup_retention = None
+        
+        # Threads used to run the independent run_proactive_analysis branches concurrently
+        self.stage_workers = 4
+        
+        # Optional JSON file the per-series state (incl. forecasters) persists to between runs
+        self.state_path = state_path
+        if state_path:
+            self.load_series_state(state_path)
+        
         self.data_loader = DataLoader()
     
-    def analyze_metrics(self, metrics_data: Dict) -> List[MetricAnalysis]:
-        """Analyze infrastructure metrics for anomalies and trends"""
+    def prepare_metrics(self, metrics_data: MetricsInput) -> PreparedMetrics:
+        """Accept the raw JSON layout, a columnar store or already-prepared series"""
+        if isinstance(metrics_data, PreparedMetrics):
+            return metrics_data
+        return PreparedMetrics.prepare(metrics_data)
+    
+    def _iter_resource_series(self, metrics_data: MetricsInput):
+        """Yield (metric, resource, timestamps, values) for every per-resource series"""
+        for series in self.prepare_metrics(metrics_data):
+            yield series.metric_name, series.resource, series.timestamps, series.values
+    
+    def analyze_metrics(self, metrics_data: MetricsInput) -> List[MetricAnalysis]:
+        """Analyze infrastructure metrics for anomalies and trends, per resource"""
         
-        analyses = []
+        series = []
+        for metric_name, resource, timestamps, values in self._iter_resource_series(metrics_data):
+            state = self._sync_series_state((metric_name, resource), timestamps, values)
+            series.append((metric_name, resource, state))
         
-        for metric_name, data_points in metrics_data.items():
-            if not data_points:
-                continue
-            
-            analysis = self._analyze_single_metric(metric_name, data_points)
-            analyses.append(analysis)
+        return self._analyze_states(series)
+    
+    def _analysis_settings(self, metric_name: str) -> tuple:
+        """Everything besides the series content that an analysis depends on"""
+        return (self._get_metric_threshold(metric_name), self.anomaly_threshold, self.anomaly_detection_mode,
+                tuple(self.percentile_band), self.stats_window)
+    
+    def _analyze_states(self, series: List[Tuple[str, str, SeriesState]]) -> List[MetricAnalysis]:
+        """Analyses for many series, reusing cached ones for series with no new points"""
+        
+        keys = [AnalysisCache.key(metric_name, resource, state.last_timestamp, state.points_seen,
+                                  self._analysis_settings(metric_name))
+                for metric_name, resource, state in series]
+        analyses = [self.analysis_cache.get(key) for key in keys]
+        missing = [i for i, analysis in enumerate(analyses) if analysis is None]
+        
+        # One regression pass covers the trend of every changed series
+        trends = self._batch_trends([series[i][2].recent_values for i in missing])
+        
+        for i, trend in zip(missing, trends):
+            metric_name, resource, state = series[i]
+            analyses[i] = self._analysis_from_state(metric_name, resource, state, trend)
+            self.analysis_cache.put(keys[i], analyses[i])
         
         return analyses
     
-    def _analyze_single_metric(self, metric_name: str, data_points: List[Dict]) -> MetricAnalysis:
-        """Analyze a single metric for anomalies and trends"""
+    def _analysis_from_state(self, metric_name: str, resource: str, state: SeriesState,
+                             trend: Optional[str] = None) -> MetricAnalysis:
+        """Build a metric analysis from a series' incremental state alone"""
         
-        # Extract values and timestamps
-        values = [point['value'] for point in data_points]
-        timestamps = [datetime.fromisoformat(point['timestamp']) for point in data_points]
-        
-        if len(values) < 2:
+        if state.points_seen < 2:
             return MetricAnalysis(
                 metric_name=metric_name,
-                current_value=values[0] if values else 0,
+                current_value=state.recent_values[-1] if state.recent_values else 0,
                 threshold_value=100,
                 is_anomaly=False,
                 severity_score=0.0,
                 trend="stable",
                 prediction="Insufficient data",
-                confidence=0.0
+                confidence=0.0,
+                resource=resource
             )
         
-        # Calculate statistics
-        current_value = values[-1]
-        mean_value = statistics.mean(values)
-        std_dev = statistics.stdev(values) if len(values) > 1 else 0
+        current_value = state.recent_values[-1]
         
         # Determine thresholds based on metric type
         threshold_value = self._get_metric_threshold(metric_name)
         
         # Detect anomalies using statistical analysis
-        is_anomaly = False
-        severity_score = 0.0
-        
-        if std_dev > 0:
-            z_score = abs(current_value - mean_value) / std_dev
-            is_anomaly = z_score > self.anomaly_threshold
-            severity_score = min(1.0, z_score / 3.0)  # Normalize to 0-1
+        is_anomaly, severity_score = self._detect_statistical_anomaly(state, current_value)
         
         # Check threshold-based anomalies
         if current_value > threshold_value:
             is_anomaly = True
             severity_score = max(severity_score, current_value / 100.0)
         
-        # Analyze trend
-        trend = self._analyze_trend(values)
+        # Analyze trend (unless already computed in a batch)
+        if trend is None:
+            trend = self._analyze_trend(list(state.recent_values))
         
         # Generate prediction and confidence
         prediction, confidence = self._generate_prediction(
@@ -125,71 +318,234 @@ class AutonomousMonitoringAgent:
             severity_score=severity_score,
             trend=trend,
             prediction=prediction,
-            confidence=confidence
+            confidence=confidence,
+            resource=resource
+        )
+    
+    def _detect_statistical_anomaly(self, state: SeriesState, current_value: float) -> Tuple[bool, float]:
+        """Score the current value against the series history using the configured mode"""
+        
+        is_anomaly = False
+        severity_score = 0.0
+        
+        if self.anomaly_detection_mode == "mad":
+            # Robust z-score: spikes barely move the median or MAD
+            median = state.sketch.quantile(0.5)
+            mad = state.sketch.median_absolute_deviation() * MAD_TO_STDEV
+            if mad > 0:
+                z_score = abs(current_value - median) / mad
+                is_anomaly = z_score > self.anomaly_threshold
+                severity_score = min(1.0, z_score / 3.0)
+        
+        elif self.anomaly_detection_mode == "percentile":
+            low, high = state.sketch.quantiles(self.percentile_band)
+            band_width = high - low
+            excess = max(low - current_value, current_value - high, 0.0)
+            if excess > 0:
+                is_anomaly = True
+                severity_score = min(1.0, 0.5 + excess / band_width) if band_width > 0 else 1.0
+        
+        else:
+            std_dev = state.stats.stdev
+            if std_dev > 0:
+                z_score = abs(current_value - state.stats.mean) / std_dev
+                is_anomaly = z_score > self.anomaly_threshold
+                severity_score = min(1.0, z_score / 3.0)  # Normalize to 0-1
+        
+        return is_anomaly, severity_score
+    
+    def fleet_percentiles(self, metric_name: str, quantiles: Tuple[float, ...] = (0.5, 0.95, 0.99)) -> Dict:
+        """Fleet-wide percentiles for a metric by merging every resource's sketch"""
+        
+        sketches = [state.sketch for (name, _), state in self.series_state.items() if name == metric_name]
+        merged = merge_sketches(sketches)
+        return {
+            'metric_name': metric_name,
+            'resources': len(sketches),
+            'points': merged.count,
+            'percentiles': {f"p{q * 100:g}": merged.quantile(q) for q in quantiles}
+        }
+    
+    def _new_series_state(self) -> SeriesState:
+        """Empty state for a newly seen series"""
+        return SeriesState(stats=RunningStats(window=self.stats_window),
+                           rollups=SeriesRollups(retention=self.rollup_retention))
+    
+    def _sync_series_state(self, key, timestamps: np.ndarray, values: np.ndarray) -> SeriesState:
+        """Bring a series' running state up to date with a full history snapshot"""
+        
+        state = self.series_state.get(key)
+        if state is None:
+            state = self.series_state[key] = self._new_series_state()
+        
+        # Resume after the checkpoint; the window may have slid forward, so older points can be gone
+        resume = 0
+        if state.last_timestamp is not None:
+            resume = int(np.searchsorted(timestamps, state.last_timestamp, side='right'))
+            if resume == 0 or timestamps[resume - 1] != state.last_timestamp:
+                # Checkpoint missing from the snapshot (history rewritten or went backwards): rebuild
+                state = self.series_state[key] = self._new_series_state()
+                resume = 0
+        
+        self._ingest_points(state, timestamps[resume:], values[resume:])
+        return state
+    
+    def ingest_metric_chunk(self, points: List[Dict]) -> int:
+        """Feed a chunk of streamed points into per-series state (constant memory)
+        
+        Each series' points are applied in timestamp order. Points at or before its checkpoint were
+        already ingested (e.g. the same export replayed against persisted state) and are skipped;
+        returns the number ingested.
+        """
+        
+        grouped = defaultdict(lambda: ([], []))
+        for point in points:
+            timestamps, values = grouped[(point['metric'], point.get('resource', ''))]
+            timestamps.append(point['timestamp'])
+            values.append(point['value'])
+        
+        ingested = 0
+        for key, (timestamps, values) in grouped.items():
+            state = self.series_state.get(key)
+            if state is None:
+                state = self.series_state[key] = self._new_series_state()
+            timestamps = parse_timestamps(timestamps)
+            values = np.array(values, dtype=np.float64)
+            if len(timestamps) > 1 and (np.diff(timestamps) < 0).any():
+                order = np.argsort(timestamps, kind='stable')
+                timestamps, values = timestamps[order], values[order]
+            if state.last_timestamp is not None:
+                newer = timestamps > state.last_timestamp
+                timestamps, values = timestamps[newer], values[newer]
+            self._ingest_points(state, timestamps, values)
+            ingested += len(values)
+        
+        return ingested
+    
+    def analyze_series_state(self) -> List[MetricAnalysis]:
+        """Analyze every tracked series from its incremental state (no history needed)"""
+        return self._analyze_states([(metric_name, resource, state)
+                                     for (metric_name, resource), state in self.series_state.items()])
+    
+    def run_streaming_analysis(self, source, chunk_size: int = 10000) -> Dict:
+        """Stream NDJSON metric points from a file or stdin and analyze with bounded memory"""
+        
+        print("🌊 Monitoring Agent: Streaming metric ingestion...")
+        
+        points_ingested = 0
+        for chunk in self.data_loader.iter_metric_chunks(source, chunk_size):
+            points_ingested += self.ingest_metric_chunk(chunk)
+        
+        analyses = self.analyze_series_state()
+        print(f"📊 Ingested {points_ingested} points into {len(analyses)} series")
+        
+        top_issues = self.generate_top_issues(analyses)
+        decisions = self.make_autonomous_decisions(top_issues)
+        action_results = self.execute_preventive_actions(decisions)
+        predictions = self._predict_from_states(
+            [(metric_name, resource, state) for (metric_name, resource), state in self.series_state.items()], 4
         )
+        change_points = self.generate_change_point_results()
+        
+        if self.state_path:
+            self.save_series_state()
+        
+        return {
+            'success': True,
+            'points_ingested': points_ingested,
+            'skipped_lines': self.data_loader.skipped_metric_lines,
+            'analyses_count': len(analyses),
+            'top_issues_count': len(top_issues),
+            'autonomous_actions': len(action_results),
+            'top_issues': top_issues,
+            'action_results': action_results,
+            'predictions': predictions,
+            'change_points': change_points
+        }
+    
+    def _ingest_points(self, state: SeriesState, timestamps: np.ndarray, values: np.ndarray):
+        """Apply new points to a series' incremental state in O(1) per point"""
+        
+        if not len(values):
+            return
+        
+        state.stats.update_many(values)
+        state.recent_values.extend(values[-RECENT_POINTS:].tolist())
+        
+        state.rollups.update(timestamps, values)
+        state.sketch.add_many(values)
+        
+        # CUSUM sees deseasonalized values, so the daily cycle itself never reads as a level shift
+        for timestamp, value in zip(timestamps.tolist(), values.tolist()):
+            if state.forecaster.initialized:
+                change_point = state.change_detector.update(timestamp, state.forecaster.deseasonalize(value))
+                if change_point is not None:
+                    state.change_points.append(change_point)
+            state.forecaster.update(timestamp, value)
+        
+        if state.first_timestamp is None:
+            state.first_timestamp = int(timestamps[0])
+        state.last_timestamp = max(int(timestamps[-1]), state.last_timestamp or int(timestamps[-1]))
+        state.points_seen += len(values)
+    
+    def save_series_state(self, state_path: Optional[str] = None):
+        """Write every series' incremental state to a JSON file"""
+        path = Path(state_path or self.state_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        states = [{'metric': metric_name, 'resource': resource, 'state': state.to_dict()}
+                  for (metric_name, resource), state in self.series_state.items()]
+        with open(path, 'w') as f:
+            json.dump({'series': states}, f)
+    
+    def load_series_state(self, state_path: Optional[str] = None) -> int:
+        """Restore series state saved by a previous run; returns the number of series"""
+        path = Path(state_path or self.state_path)
+        if not path.exists():
+            return 0
+        
+        with open(path, 'r') as f:
+            data = json.load(f)
+        
+        for entry in data.get('series', []):
+            self.series_state[(entry['metric'], entry['resource'])] = SeriesState.from_dict(entry['state'])
+        return len(data.get('series', []))
     
     def _get_metric_threshold(self, metric_name: str) -> float:
         """Get appropriate threshold based on metric type"""
-        thresholds = {
-            'cpu_utilization': 85.0,
-            'memory_usage': 90.0,
-            'disk_usage': 85.0,
-            'network_throughput': 80.0,
-            'error_rate': 5.0,
-            'response_time': 2000.0  # milliseconds
-        }
-        return thresholds.get(metric_name, 80.0)
+        return METRIC_THRESHOLDS.get(metric_name, DEFAULT_METRIC_THRESHOLD)
     
     def _analyze_trend(self, values: List[float]) -> str:
         """Analyze trend in metric values"""
-        if len(values) < 3:
-            return "stable"
+        return self._batch_trends([values])[0]
+    
+    def _batch_trends(self, series_values: List) -> List[str]:
+        """Classify the trend of many series with a single batched regression"""
         
-        # Simple trend analysis using recent values
-        recent_values = values[-5:]  # Last 5 data points
+        trends = ["stable"] * len(series_values)
         
-        if len(recent_values) < 2:
-            return "stable"
+        # Simple trend analysis using the last few points of each series with enough data
+        indices = [i for i, values in enumerate(series_values) if len(values) >= 3]
+        if not indices:
+            return trends
         
-        # Calculate slope
-        x = list(range(len(recent_values)))
-        y = recent_values
+        windows = [np.asarray(series_values[i], dtype=np.float64)[-TREND_POINTS:] for i in indices]
+        slopes = batched_trend_projection(windows, 0, 0.0)['slope']
         
-        # Simple linear regression slope
-        n = len(x)
-        slope = (n * sum(x[i] * y[i] for i in range(n)) - sum(x) * sum(y)) / (n * sum(x[i]**2 for i in range(n)) - sum(x)**2)
+        for i, slope in zip(indices, slopes):
+            if slope > 1.0:
+                trends[i] = "increasing"
+            elif slope < -1.0:
+                trends[i] = "decreasing"
         
-        if slope > 1.0:
-            return "increasing"
-        elif slope < -1.0:
-            return "decreasing"
-        else:
-            return "stable"
+        return trends
     
     def _generate_prediction(self, metric_name: str, current_value: float, 
                            trend: str, severity_score: float) -> Tuple[str, float]:
         """Generate prediction and confidence score"""
         
-        predictions = {
-            'cpu_utilization': {
-                'increasing': "CPU usage trending upward - potential performance degradation",
-                'decreasing': "CPU usage normalizing - system recovering",
-                'stable': "CPU usage stable within normal range"
-            },
-            'memory_usage': {
-                'increasing': "Memory usage climbing - possible memory leak detected",
-                'decreasing': "Memory usage decreasing - system optimization effective",
-                'stable': "Memory usage stable - no immediate concerns"
-            },
-            'disk_usage': {
-                'increasing': "Disk space consumption accelerating - storage cleanup needed",
-                'decreasing': "Disk usage optimized - cleanup activities successful",
-                'stable': "Disk usage stable - adequate storage available"
-            }
-        }
-        
         # Get prediction based on metric and trend
-        metric_predictions = predictions.get(metric_name, {
+        metric_predictions = TREND_PREDICTIONS.get(metric_name, {
             'increasing': f"{metric_name} trending upward - monitoring required",
             'decreasing': f"{metric_name} improving - positive trend",
             'stable': f"{metric_name} stable - no action needed"
@@ -211,13 +567,20 @@ class AutonomousMonitoringAgent:
     def generate_top_issues(self, analyses: List[MetricAnalysis]) -> List[MonitoringResult]:
         """Generate top 3 issues requiring immediate attention"""
         
-        # Filter for anomalies and sort by severity
-        anomalies = [analysis for analysis in analyses if analysis.is_anomaly]
-        anomalies.sort(key=lambda x: x.severity_score, reverse=True)
+        # Severity per analysis in one array; non-anomalies never rank
+        scores = np.fromiter((analysis.severity_score if analysis.is_anomaly else -np.inf
+                              for analysis in analyses), dtype=np.float64, count=len(analyses))
+        
+        # Co-moving anomalies on one resource become one issue, led by its most severe metric
+        groups = self._top_issue_groups(analyses, scores, TOP_ISSUE_COUNT)
         
         top_issues = []
+        now = datetime.now()
+        self.alert_cache.expire(now)
         
-        for i, analysis in enumerate(anomalies[:3]):  # Top 3 issues
+        for i, group in enumerate(groups):  # Top 3 issues
+            analysis = group['members'][0]
+            
             # Determine alert severity
             if analysis.severity_score >= self.critical_threshold:
                 alert_severity = AlertSeverity.CRITICAL
@@ -228,6 +591,17 @@ class AutonomousMonitoringAgent:
             
             # Generate recommended actions
             recommended_actions = self._generate_recommended_actions(analysis)
+            reasoning = self._generate_monitoring_reasoning(analysis)
+            
+            related_metrics = [member.metric_name for member in group['members'][1:]]
+            leading_indicator = group['leader'].metric_name if group['leader'] is not None else ""
+            if related_metrics:
+                reasoning += f"; moves with {', '.join(related_metrics)} (r={group['correlation']:.2f})"
+            if leading_indicator:
+                lead_minutes = group['lead_seconds'] / 60
+                reasoning += f"; {leading_indicator} moves first (~{lead_minutes:.0f} min ahead), likely root cause"
+                recommended_actions = ([f"Start root-cause analysis with {leading_indicator} on {analysis.resource}"] +
+                                       recommended_actions[:3])
             
             # Assess business impact
             business_impact = self._assess_business_impact(analysis)
@@ -240,54 +614,177 @@ class AutonomousMonitoringAgent:
             else:
                 confidence_level = ConfidenceLevel.LOW
             
+            # Repeat detections of an active alert keep its id and bump its occurrence count
+            fingerprint = AlertCache.fingerprint(analysis.metric_name, analysis.resource, alert_severity.value)
+            active_alert, _ = self.alert_cache.observe(
+                fingerprint, f"MON-{now.strftime('%Y%m%d%H%M%S')}-{i+1}", now
+            )
+            
             # Create monitoring result
             result = MonitoringResult(
-                alert_id=f"MON-{datetime.now().strftime('%Y%m%d%H%M%S')}-{i+1}",
+                alert_id=active_alert.alert_id,
                 anomaly_detected=True,
                 severity_score=analysis.severity_score,
                 confidence_level=confidence_level,
                 recommended_actions=recommended_actions,
                 business_impact=business_impact,
                 priority_rank=i + 1,
-                reasoning=self._generate_monitoring_reasoning(analysis),
-                created_at=datetime.now(),
-                agent_id="monitoring_agent"
+                reasoning=reasoning,
+                created_at=active_alert.first_seen,
+                agent_id="monitoring_agent",
+                metric_name=analysis.metric_name,
+                resource=analysis.resource,
+                fingerprint=fingerprint,
+                occurrence_count=active_alert.occurrence_count,
+                suppressed_actions=active_alert.suppressed_actions,
+                related_metrics=related_metrics,
+                leading_indicator=leading_indicator
             )
             
             top_issues.append(result)
         
         self.top_issues = top_issues
+        self._update_active_issues(analyses, top_issues)
         return top_issues
     
+    def _update_active_issues(self, analyses: List[MetricAnalysis], top_issues: List[MonitoringResult]):
+        """Drop issues whose series was re-analyzed as normal, then record this run's issues"""
+        for analysis in analyses:
+            if not analysis.is_anomaly:
+                self.active_issues.pop((analysis.metric_name, analysis.resource), None)
+        for issue in top_issues:
+            self.active_issues[(issue.metric_name, issue.resource)] = issue
+    
+    def get_active_issues(self) -> List[MonitoringResult]:
+        """Every issue still active, including ones on series without new points, most severe first"""
+        return sorted(self.active_issues.values(), key=lambda issue: issue.severity_score, reverse=True)
+    
+    def _top_issue_groups(self, analyses: List[MetricAnalysis], scores: np.ndarray, limit: int) -> List[Dict]:
+        """The `limit` highest-ranked issue groups, selected without sorting every analysis
+        
+        Only the top candidates (plus anomalies sharing their resources, which they may group
+        with) are ranked; the candidate count doubles only while merged groups leave too few.
+        """
+        
+        anomaly_count = int(np.isfinite(scores).sum())
+        candidates = limit
+        while True:
+            ranked = top_n_indices(scores, candidates).tolist()
+            resources = {analyses[i].resource for i in ranked if analyses[i].resource}
+            ranked_set = set(ranked)
+            neighbours = [i for i in np.flatnonzero(np.isfinite(scores)).tolist()
+                          if i not in ranked_set and analyses[i].resource in resources] if resources else []
+            neighbours.sort(key=lambda i: -scores[i])
+            
+            # Groups keep the order of their first member, so those led by a ranked candidate come first
+            groups = self._group_comoving_anomalies([analyses[i] for i in ranked + neighbours])
+            first_positions = {id(analyses[i]): position for position, i in enumerate(ranked)}
+            groups = [group for group in groups if id(group['members'][0]) in first_positions]
+            
+            if len(groups) >= limit or len(ranked) >= anomaly_count:
+                return groups[:limit]
+            candidates *= 2
+    
+    def _group_comoving_anomalies(self, anomalies: List[MetricAnalysis]) -> List[Dict]:
+        """Group anomalies whose histories move together on the same resource
+
+        Groups keep the order of their first member in `anomalies`; singletons are groups of one.
+        """
+        
+        by_resource = defaultdict(list)
+        for index, analysis in enumerate(anomalies):
+            if analysis.resource:
+                by_resource[analysis.resource].append(index)
+        
+        group_of = {}
+        details = []
+        for resource, indices in by_resource.items():
+            if len(indices) < 2:
+                continue
+            histories = [self.query_metric_history(anomalies[i].metric_name, resource, self.comovement_hours,
+                                                   min_buckets=COMOVEMENT_MIN_BUCKETS) for i in indices]
+            series = [(i, history) for i, history in zip(indices, histories)
+                      if history is not None and len(history['starts']) > 1]
+            if len(series) < 2:
+                continue
+            usable = [i for i, _ in series]
+            
+            # One aligned matrix and one lagged-correlation tensor per resource
+            matrix, step = align_series([(history['starts'], history['mean']) for _, history in series])
+            lags, correlations = lagged_correlations(matrix, self.comovement_max_lag)
+            for group in comoving_groups(lags, correlations, range(len(usable)), self.comovement_min_correlation):
+                for row in group['members']:
+                    group_of[usable[row]] = len(details)
+                details.append({
+                    'leader': anomalies[usable[group['leader']]] if group['leader'] is not None else None,
+                    'lead_seconds': group['lead_steps'] * step / 1_000_000,
+                    'correlation': group['correlation']
+                })
+        
+        groups = []
+        emitted = {}
+        for index, analysis in enumerate(anomalies):
+            if index not in group_of:
+                groups.append({'members': [analysis], 'leader': None, 'lead_seconds': 0.0, 'correlation': 0.0})
+            elif group_of[index] in emitted:
+                emitted[group_of[index]]['members'].append(analysis)
+            else:
+                emitted[group_of[index]] = {'members': [analysis], **details[group_of[index]]}
+                groups.append(emitted[group_of[index]])
+        return groups
+    
+    def generate_change_point_results(self) -> List[MonitoringResult]:
+        """Report level shifts confirmed since the last call (each change point is reported once)"""
+        
+        change_points = []
+        for (metric_name, resource), state in self.series_state.items():
+            while state.change_points:
+                change_points.append((metric_name, resource, state.change_points.popleft()))
+        change_points.sort(key=lambda item: abs(item[2]['shift_sigmas']), reverse=True)
+        
+        now = datetime.now()
+        results = []
+        for i, (metric_name, resource, change_point) in enumerate(change_points):
+            shift = abs(change_point['shift_sigmas'])
+            started_at = from_epoch_micros(change_point['started_at'])
+            series_name = f"{metric_name} on {resource}" if resource else metric_name
+            is_critical_system = bool(resource) and any(
+                critical in resource for critical in self.critical_systems
+            )
+            
+            results.append(MonitoringResult(
+                alert_id=f"CHG-{now.strftime('%Y%m%d%H%M%S')}-{i+1}",
+                anomaly_detected=True,
+                severity_score=min(1.0, shift / 6),
+                confidence_level=ConfidenceLevel.HIGH if shift >= 3 else ConfidenceLevel.MEDIUM,
+                recommended_actions=[
+                    f"Review deployments and configuration changes around {started_at:%Y-%m-%d %H:%M}",
+                    f"Confirm the new {metric_name} level is expected before it becomes the baseline",
+                    "Compare with other metrics on the same resource for a shared cause"
+                ],
+                business_impact=("High - Sustained shift on a critical system" if is_critical_system
+                                 else "Medium - Sustained behavior change"),
+                priority_rank=None,
+                reasoning=(f"{series_name} level {change_point['direction']} from "
+                           f"{change_point['baseline_mean']:.1f} to {change_point['new_level']:.1f} "
+                           f"({change_point['shift_sigmas']:+.1f}σ) starting {started_at:%Y-%m-%d %H:%M}"),
+                created_at=now,
+                agent_id="monitoring_agent",
+                metric_name=metric_name,
+                resource=resource,
+                fingerprint=AlertCache.fingerprint(metric_name, resource, f"shift-{change_point['direction']}")
+            ))
+        
+        return results
+    
     def _generate_recommended_actions(self, analysis: MetricAnalysis) -> List[str]:
         """Generate actionable recommendations based on metric analysis"""
         
-        actions = {
-            'cpu_utilization': [
-                "Check for runaway processes using top/htop",
-                "Review recent deployments for performance issues",
-                "Consider scaling up server resources",
-                "Investigate high CPU consuming applications"
-            ],
-            'memory_usage': [
-                "Investigate potential memory leaks in applications",
-                "Restart services with high memory consumption",
-                "Review application logs for memory-related errors",
-                "Consider increasing available memory"
-            ],
-            'disk_usage': [
-                "Clean up temporary files and logs",
-                "Archive old data to secondary storage",
-                "Review disk usage by directory (du -sh /*)",
-                "Plan for additional storage capacity"
-            ]
-        }
-        
-        base_actions = actions.get(analysis.metric_name, [
+        base_actions = list(RECOMMENDED_ACTIONS.get(analysis.metric_name, [
             f"Monitor {analysis.metric_name} closely",
             "Review system logs for related errors",
             "Consider preventive maintenance"
-        ])
+        ]))
         
         # Add urgency-based actions
         if analysis.severity_score > 0.9:
@@ -301,8 +798,9 @@ class AutonomousMonitoringAgent:
         """Assess business impact of the detected issue"""
         
         # Check if it affects critical systems
-        resource = next((dp.get('resource', '') for dp in [{}]), '')
-        is_critical_system = any(critical in resource for critical in self.critical_systems)
+        is_critical_system = bool(analysis.resource) and any(
+            critical in analysis.resource for critical in self.critical_systems
+        )
         
         if analysis.severity_score >= 0.9:
             if is_critical_system:
@@ -323,7 +821,9 @@ class AutonomousMonitoringAgent:
         reasoning_parts = []
         
         # Current state
-        reasoning_parts.append(f"{analysis.metric_name} at {analysis.current_value:.1f}%")
+        series_name = (f"{analysis.metric_name} on {analysis.resource}" if analysis.resource 
+                       else analysis.metric_name)
+        reasoning_parts.append(f"{series_name} at {analysis.current_value:.1f}%")
         
         # Threshold comparison
         if analysis.current_value > analysis.threshold_value:
@@ -354,6 +854,7 @@ class AutonomousMonitoringAgent:
                 'alert_id': issue.alert_id,
                 'autonomous_action': False,
                 'action_taken': None,
+                'suppressed': False,
                 'reasoning': '',
                 'timestamp': datetime.now()
             }
@@ -373,6 +874,17 @@ class AutonomousMonitoringAgent:
                     action = "send_alert_notification"
                     decision['reasoning'] = "High confidence anomaly - sending proactive alert"
                 
+                # An alert already acted on stays quiet until its re-notify interval passes
+                if issue.fingerprint and not self.alert_cache.should_notify(issue.fingerprint):
+                    issue.suppressed_actions += 1
+                    issue.suppressed = True
+                    decision['suppressed'] = True
+                    decision['reasoning'] = (f"Repeat detection #{issue.occurrence_count} of {issue.alert_id} - "
+                                             f"{action} already taken, suppressed until re-notify interval")
+                    print(f"🔕 Monitoring Agent: Suppressed duplicate {action} for {issue.alert_id}")
+                    decisions.append(decision)
+                    continue
+                
                 decision['autonomous_action'] = True
                 decision['action_taken'] = action
                 issue.auto_executed = True
@@ -437,68 +949,94 @@ class AutonomousMonitoringAgent:
         
         return results
     
-    def predict_future_issues(self, metrics_data: Dict, prediction_window_hours: int = 4) -> List[Dict]:
+    def predict_future_issues(self, metrics_data: MetricsInput, 
+                              prediction_window_hours: int = 4) -> List[Dict]:
         """Predict potential issues in the next few hours based on current trends"""
         
+        series = [(metric_name, resource, self._sync_series_state((metric_name, resource), timestamps, values))
+                  for metric_name, resource, timestamps, values in self._iter_resource_series(metrics_data)]
+        return self._predict_from_states(series, prediction_window_hours)
+    
+    def _predict_from_states(self, series: List[Tuple[str, str, SeriesState]],
+                             prediction_window_hours: int) -> List[Dict]:
+        """Seasonal forecasts where warmed up, batched linear extrapolation otherwise"""
+        
         predictions = []
+        linear_series = []
         
-        for metric_name, data_points in metrics_data.items():
-            if len(data_points) < 3:
+        for metric_name, resource, state in series:
+            if state.points_seen < 3:
+                continue
+            if not state.forecaster.is_ready:
+                linear_series.append((metric_name, resource, state))
                 continue
             
-            # Extract recent values for trend analysis
-            recent_values = [point['value'] for point in data_points[-10:]]  # Last 10 points
+            # Holt-Winters path over the window; the daily season keeps normal peaks below threshold
+            forecaster = state.forecaster
+            path = forecaster.forecast_path(forecaster.steps_for_hours(prediction_window_hours))
+            threshold = self._get_metric_threshold(metric_name)
+            crossings = np.flatnonzero(path > threshold)
+            if not len(crossings):
+                continue
             
-            # Simple linear extrapolation
-            if len(recent_values) >= 3:
-                # Calculate trend slope
-                x = list(range(len(recent_values)))
-                y = recent_values
-                n = len(x)
-                
-                if n > 1 and sum(xi**2 for xi in x) != (sum(x)**2 / n):
-                    slope = (n * sum(x[i] * y[i] for i in range(n)) - sum(x) * sum(y)) / (n * sum(xi**2 for xi in x) - sum(x)**2)
-                    intercept = (sum(y) - slope * sum(x)) / n
-                    
-                    # Predict future values
-                    future_value = slope * (len(recent_values) + prediction_window_hours) + intercept
-                    
-                    # Check if prediction exceeds thresholds
-                    threshold = self._get_metric_threshold(metric_name)
-                    
-                    if future_value > threshold:
-                        risk_level = "HIGH" if future_value > threshold * 1.1 else "MEDIUM"
-                        
-                        predictions.append({
-                            'metric_name': metric_name,
-                            'current_value': recent_values[-1],
-                            'predicted_value': future_value,
-                            'threshold': threshold,
-                            'risk_level': risk_level,
-                            'time_to_threshold': self._calculate_time_to_threshold(recent_values, slope, intercept, threshold),
-                            'confidence': min(0.9, 0.5 + (len(recent_values) / 20)),  # More data = higher confidence
-                            'recommended_action': self._get_predictive_action(metric_name, future_value, threshold)
-                        })
+            future_value = float(path.max())
+            hours_per_step = forecaster.interval_micros / MICROS_PER_HOUR
+            risk_level = "HIGH" if future_value > threshold * 1.1 else "MEDIUM"
+            
+            predictions.append({
+                'metric_name': metric_name,
+                'resource': resource,
+                'current_value': state.recent_values[-1],
+                'predicted_value': future_value,
+                'threshold': threshold,
+                'risk_level': risk_level,
+                'time_to_threshold': float(crossings[0] + 1) * hours_per_step,
+                'confidence': min(0.9, 0.5 + forecaster.points_seen / (20 * forecaster.season_length)),
+                'recommended_action': self._get_predictive_action(metric_name, future_value, threshold),
+                'model': 'holt_winters'
+            })
+        
+        if linear_series:
+            predictions.extend(self._linear_predictions(linear_series, prediction_window_hours))
         
         # Sort by risk level and time to threshold
         predictions.sort(key=lambda x: (x['risk_level'] == 'HIGH', -x['time_to_threshold']))
         
         return predictions
     
-    def _calculate_time_to_threshold(self, values: List[float], slope: float, intercept: float, threshold: float) -> float:
-        """Calculate estimated time until threshold is reached (in hours)"""
-        
-        if slope <= 0:
-            return float('inf')  # Not trending toward threshold
-        
-        current_x = len(values) - 1
-        current_value = values[-1]
+    def _linear_predictions(self, series: List[Tuple[str, str, SeriesState]],
+                            prediction_window_hours: int) -> List[Dict]:
+        """Straight-line extrapolation over the last 10 points of each series, in one batch"""
         
-        # Solve: slope * x + intercept = threshold
-        threshold_x = (threshold - intercept) / slope
-        time_to_threshold = max(0, threshold_x - current_x)
+        predictions = []
+        windows = [np.asarray(state.recent_values, dtype=np.float64) for _, _, state in series]
+        
+        # Simple linear extrapolation of every series in one batched pass
+        thresholds = np.array([self._get_metric_threshold(metric_name) for metric_name, _, _ in series])
+        projection = batched_trend_projection(windows, prediction_window_hours, thresholds)
+        
+        # Check which predictions exceed thresholds
+        for i in np.flatnonzero(projection['projected_value'] > thresholds):
+            metric_name, resource, _ = series[i]
+            recent_values = windows[i]
+            future_value = float(projection['projected_value'][i])
+            threshold = float(thresholds[i])
+            risk_level = "HIGH" if future_value > threshold * 1.1 else "MEDIUM"
+            
+            predictions.append({
+                'metric_name': metric_name,
+                'resource': resource,
+                'current_value': float(recent_values[-1]),
+                'predicted_value': future_value,
+                'threshold': threshold,
+                'risk_level': risk_level,
+                'time_to_threshold': float(projection['time_to_threshold'][i]),
+                'confidence': min(0.9, 0.5 + (len(recent_values) / 20)),  # More data = higher confidence
+                'recommended_action': self._get_predictive_action(metric_name, future_value, threshold),
+                'model': 'linear'
+            })
         
-        return time_to_threshold
+        return predictions
     
     def _get_predictive_action(self, metric_name: str, predicted_value: float, threshold: float) -> str:
         """Get recommended preventive action based on prediction"""
@@ -514,7 +1052,19 @@ class AutonomousMonitoringAgent:
         
         return actions.get(metric_name, f'Monitor {metric_name} closely and prepare mitigation plan')
     
-    def generate_capacity_recommendations(self, metrics_data: Dict) -> Dict:
+    def query_metric_history(self, metric_name: str, resource: str = "", range_hours: Optional[float] = None,
+                             min_buckets: int = 1) -> Optional[Dict]:
+        """Read a series' history from the coarsest rollup tier that satisfies the range"""
+        
+        state = self.series_state.get((metric_name, resource))
+        if state is None or state.last_timestamp is None:
+            return None
+        
+        start = None if range_hours is None else state.last_timestamp - int(range_hours * MICROS_PER_HOUR)
+        return state.rollups.query(start, min_buckets=min_buckets)
+    
+    def generate_capacity_recommendations(self, metrics_data: MetricsInput,
+                                          range_hours: Optional[float] = None) -> Dict:
         """Generate capacity planning recommendations based on usage trends"""
         
         recommendations = {
@@ -524,83 +1074,98 @@ class AutonomousMonitoringAgent:
             'cost_optimization': []
         }
         
-        for metric_name, data_points in metrics_data.items():
-            if len(data_points) < 5:
+        # Rollups replace raw scans: totals from the coarsest tier, trend from one with enough buckets
+        series = []
+        for metric_name, resource, timestamps, values in self._iter_resource_series(metrics_data):
+            self._sync_series_state((metric_name, resource), timestamps, values)
+            summary = self.query_metric_history(metric_name, resource, range_hours)
+            history = self.query_metric_history(metric_name, resource, range_hours, min_buckets=TREND_POINTS)
+            if summary is None or summary['count'].sum() < 5:
                 continue
+            series.append((metric_name, resource, summary, history['mean']))
+        trends = self._batch_trends([means for _, _, _, means in series])
+        
+        for (metric_name, resource, summary, _), trend in zip(series, trends):
             
-            values = [point['value'] for point in data_points]
-            current_value = values[-1]
-            avg_value = sum(values) / len(values)
-            max_value = max(values)
+            series_name = f"{metric_name} on {resource}" if resource else metric_name
+            current_value = float(summary['last'][-1])
+            avg_value = float(summary['sum'].sum() / summary['count'].sum())
+            max_value = float(summary['max'].max())
             
             # Immediate actions (>90% utilization)
             if current_value > 90:
                 recommendations['immediate_actions'].append(
-                    f"URGENT: {metric_name} at {current_value:.1f}% - immediate capacity increase needed"
+                    f"URGENT: {series_name} at {current_value:.1f}% - immediate capacity increase needed"
                 )
             
             # Short-term planning (trending upward, >75%)
-            elif current_value > 75 and self._analyze_trend(values) == "increasing":
+            elif current_value > 75 and trend == "increasing":
                 recommendations['short_term_planning'].append(
-                    f"{metric_name} trending up (current: {current_value:.1f}%) - plan capacity increase within 30 days"
+                    f"{series_name} trending up (current: {current_value:.1f}%) - plan capacity increase within 30 days"
                 )
             
             # Long-term planning (average >60%)
             elif avg_value > 60:
                 recommendations['long_term_planning'].append(
-                    f"{metric_name} average utilization {avg_value:.1f}% - consider capacity planning for next quarter"
+                    f"{series_name} average utilization {avg_value:.1f}% - consider capacity planning for next quarter"
                 )
             
             # Cost optimization (consistently low usage)
             elif max_value < 30 and avg_value < 20:
                 recommendations['cost_optimization'].append(
-                    f"{metric_name} underutilized (avg: {avg_value:.1f}%, max: {max_value:.1f}%) - consider downsizing"
+                    f"{series_name} underutilized (avg: {avg_value:.1f}%, max: {max_value:.1f}%) - consider downsizing"
                 )
         
         return recommendations
     
-    def detect_anomaly_patterns(self, metrics_data: Dict) -> List[Dict]:
+    def generate_capacity_table(self, metrics_data: MetricsInput) -> List[Dict]:
+        """p50/p95/max, growth and projected saturation for every series, as sortable rows"""
+        
+        series = list(self._iter_resource_series(metrics_data))
+        if not series:
+            return []
+        
+        metrics = capacity_metrics(
+            [timestamps for _, _, timestamps, _ in series],
+            [values for _, _, _, values in series],
+            [self._get_metric_threshold(metric_name) for metric_name, _, _, _ in series]
+        )
+        return capacity_table([(metric_name, resource) for metric_name, resource, _, _ in series], metrics)
+    
+    def detect_anomaly_patterns(self, metrics_data: MetricsInput) -> List[Dict]:
         """Detect recurring anomaly patterns that might indicate systemic issues"""
         
         patterns = []
         
-        for metric_name, data_points in metrics_data.items():
-            if len(data_points) < 10:
+        # Periodic spikes: every series' spike schedule is checked in one FFT batch
+        candidates = []
+        for metric_name, resource, timestamps, values in self._iter_resource_series(metrics_data):
+            if len(values) < 10:
                 continue
             
-            values = [point['value'] for point in data_points]
-            timestamps = [datetime.fromisoformat(point['timestamp']) for point in data_points]
-            
-            # Detect periodic spikes
-            spikes = []
-            threshold = self._get_metric_threshold(metric_name)
-            
-            for i, value in enumerate(values):
-                if value > threshold:
-                    spikes.append({
-                        'index': i,
-                        'value': value,
-                        'timestamp': timestamps[i]
-                    })
+            spike_mask = values > self._get_metric_threshold(metric_name)
+            if spike_mask.sum() >= 3:
+                candidates.append((metric_name, resource, timestamps, spike_mask))
+        
+        periods = detect_spike_periods([(timestamps, spike_mask) for _, _, timestamps, spike_mask in candidates])
+        
+        for (metric_name, resource, timestamps, spike_mask), period in zip(candidates, periods):
+            if period is None:
+                continue
             
-            if len(spikes) >= 3:
-                # Check for time-based patterns
-                spike_hours = [spike['timestamp'].hour for spike in spikes]
-                
-                # Check if spikes occur at similar times
-                from collections import Counter
-                hour_counts = Counter(spike_hours)
-                most_common_hour, count = hour_counts.most_common(1)[0]
-                
-                if count >= 2:  # At least 2 spikes at same hour
-                    patterns.append({
-                        'metric_name': metric_name,
-                        'pattern_type': 'time_based_spikes',
-                        'description': f'Recurring spikes around {most_common_hour:02d}:00',
-                        'frequency': count,
-                        'severity': 'HIGH' if count >= 3 else 'MEDIUM',
-                        'recommendation': f'Investigate scheduled processes or peak usage at {most_common_hour:02d}:00'
-                    })
+            frequency = int(spike_mask.sum())
+            patterns.append({
+                'metric_name': metric_name,
+                'resource': resource,
+                'pattern_type': 'periodic_spikes',
+                'description': f'Recurring spikes {period["schedule"]}',
+                'frequency': frequency,
+                'period_label': period['period_label'],
+                'period_seconds': period['period_seconds'],
+                'strength': period['strength'],
+                'severity': 'HIGH' if frequency >= 3 and period['strength'] >= 0.5 else 'MEDIUM',
+                'recommendation': f'Investigate scheduled processes or peak usage recurring {period["schedule"]}'
+            })
         
         return patterns
     
@@ -610,54 +1175,195 @@ class AutonomousMonitoringAgent:
             'alerts_generated': len(self.alerts_generated),
             'top_issues_identified': len(self.top_issues),
             'autonomous_actions': sum(1 for issue in self.top_issues if issue.auto_executed),
+            'suppressed_decisions': sum(1 for issue in self.top_issues if issue.suppressed),
             'false_positive_rate': self.false_positive_rate,
             'accuracy_score': self.accuracy_score,
             'critical_threshold': self.critical_threshold,
-            'warning_threshold': self.warning_threshold
+            'warning_threshold': self.warning_threshold,
+            **self.alert_cache.get_stats(),
+            **self.analysis_cache.get_stats()
         }
     
+    def _timed_stage(self, stage, *args) -> Tuple:
+        """Run one pipeline stage and return (output, wall seconds)"""
+        started = time.perf_counter()
+        output = stage(*args)
+        return output, time.perf_counter() - started
+    
+    def _run_issue_pipeline(self, metrics_data: MetricsInput) -> Tuple[List[MetricAnalysis], List[MonitoringResult], List[Dict]]:
+        """Analyze metrics, pick the top issues, decide and act on them"""
+        
+        analyses = self.analyze_metrics(metrics_data)
+        
+        # Generate top 3 issues
+        top_issues = self.generate_top_issues(analyses)
+        
+        # Make autonomous decisions
+        decisions = self.make_autonomous_decisions(top_issues)
+        
+        # Execute preventive actions
+        action_results = self.execute_preventive_actions(decisions)
+        
+        return analyses, top_issues, action_results
+    
     def run_proactive_analysis(self) -> Dict:
         """Run complete proactive monitoring analysis"""
         
         print("🔍 Monitoring Agent: Starting proactive analysis...")
         
-        # Load sample metrics
-        metrics_data = self.data_loader.load_metrics()
+        # Parse, split and validate every series once (or map the binary archive); all stages share the result
+        metrics_data = self.data_loader.load_prepared_metrics()
+        print(f"🧮 Prepared {len(metrics_data)} series in {metrics_data.parse_seconds * 1000:.1f}ms")
         
         if not metrics_data:
             print("❌ No metrics data available")
             return {'success': False, 'reason': 'No metrics data'}
         
-        # Analyze metrics
-        analyses = self.analyze_metrics(metrics_data)
-        print(f"📊 Analyzed {len(analyses)} metrics")
+        stage_timings = {'parse': metrics_data.parse_seconds}
+        
+        # Bring per-series state up to date once, so the branches below only read it
+        started = time.perf_counter()
+        for metric_name, resource, timestamps, values in self._iter_resource_series(metrics_data):
+            self._sync_series_state((metric_name, resource), timestamps, values)
+        stage_timings['sync'] = time.perf_counter() - started
+        
+        # The issue pipeline, predictions, capacity and patterns are independent branches
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.stage_workers) as pool:
+            branches = {
+                'issues': pool.submit(self._timed_stage, self._run_issue_pipeline, metrics_data),
+                'predictions': pool.submit(self._timed_stage, self.predict_future_issues, metrics_data),
+                'capacity': pool.submit(self._timed_stage, self.generate_capacity_recommendations, metrics_data),
+                'capacity_table': pool.submit(self._timed_stage, self.generate_capacity_table, metrics_data),
+                'patterns': pool.submit(self._timed_stage, self.detect_anomaly_patterns, metrics_data)
+            }
+            outputs = {}
+            for name, future in branches.items():
+                outputs[name], stage_timings[name] = future.result()
+        stage_timings['branches'] = time.perf_counter() - started
+        
+        analyses, top_issues, action_results = outputs['issues']
+        predictions = outputs['predictions']
+        capacity_recommendations = outputs['capacity']
+        capacity_table = outputs['capacity_table']
+        anomaly_patterns = outputs['patterns']
+        change_points = self.generate_change_point_results()
         
-        # Generate top 3 issues
-        top_issues = self.generate_top_issues(analyses)
+        print(f"📊 Analyzed {len(analyses)} metrics")
         print(f"⚠️ Identified {len(top_issues)} top priority issues")
+        print(f"🔮 Generated {len(predictions)} predictions")
+        print(f"📈 Found {len(anomaly_patterns)} anomaly patterns")
+        print(f"📐 Detected {len(change_points)} level shifts")
+        print(f"⏱️ Branches finished in {stage_timings['branches'] * 1000:.1f}ms "
+              f"(slowest: {max(branches, key=stage_timings.get)})")
         
-        # Make autonomous decisions
-        decisions = self.make_autonomous_decisions(top_issues)
+        if self.state_path:
+            self.save_series_state()
         
-        # Execute preventive actions
+        return {
+            'success': True,
+            'parse_seconds': metrics_data.parse_seconds,
+            'dropped_points': metrics_data.dropped_points,
+            'stage_timings': stage_timings,
+            'analyses_count': len(analyses),
+            'top_issues_count': len(top_issues),
+            'autonomous_actions': len(action_results),
+            'top_issues': top_issues,
+            'action_results': action_results,
+            'predictions': predictions,
+            'capacity_recommendations': capacity_recommendations,
+            'capacity_table': capacity_table,
+            'anomaly_patterns': anomaly_patterns,
+            'change_points': change_points
+        }
+    
+    def run_incremental_analysis(self, metrics_data: MetricsInput) -> Dict:
+        """Analyze only the series that received points since the last checkpoint"""
+        
+        metrics_data = self.prepare_metrics(metrics_data)
+        
+        # Sync state; each series ingests only points beyond its checkpoint
+        new_points = 0
+        updated = []
+        for metric_name, resource, timestamps, values in self._iter_resource_series(metrics_data):
+            key = (metric_name, resource)
+            previous = self.series_state.get(key)
+            seen_before = previous.points_seen if previous else 0
+            state = self._sync_series_state(key, timestamps, values)
+            
+            if state is not previous:
+                seen_before = 0  # new or rebuilt series
+            if state.points_seen > seen_before:
+                new_points += state.points_seen - seen_before
+                updated.append((metric_name, resource, state))
+        
+        return self._analyze_updated_series(updated, new_points, metrics_data.parse_seconds)
+    
+    def run_ingested_analysis(self, points: List[Dict], chunk_size: int = 10000) -> Dict:
+        """Ingest newly arrived points (e.g. from watched drop files) and analyze the touched series"""
+        
+        started = time.perf_counter()
+        keys = {(point['metric'], point.get('resource', '')) for point in points}
+        seen_before = {key: self.series_state[key].points_seen if key in self.series_state else 0 for key in keys}
+        
+        for start in range(0, len(points), chunk_size):
+            self.ingest_metric_chunk(points[start:start + chunk_size])
+        
+        updated = [(metric_name, resource, self.series_state[(metric_name, resource)])
+                   for metric_name, resource in keys]
+        new_points = sum(state.points_seen - seen_before[(metric_name, resource)]
+                         for metric_name, resource, state in updated)
+        return self._analyze_updated_series(updated, new_points, time.perf_counter() - started)
+    
+    def _analyze_updated_series(self, updated: List[Tuple[str, str, SeriesState]], new_points: int,
+                                parse_seconds: float) -> Dict:
+        """Analysis, actions and predictions for the series that changed since the last run"""
+        
+        analyses = self._analyze_states(updated)
+        
+        top_issues = self.generate_top_issues(analyses)
+        decisions = self.make_autonomous_decisions(top_issues)
         action_results = self.execute_preventive_actions(decisions)
+        predictions = self._predict_from_states(updated, 4)
+        change_points = self.generate_change_point_results()
         
-        # Generate predictions and capacity recommendations
-        predictions = self.predict_future_issues(metrics_data)
-        capacity_recommendations = self.generate_capacity_recommendations(metrics_data)
-        anomaly_patterns = self.detect_anomaly_patterns(metrics_data)
+        # Ticks only analyze the delta; the snapshot also carries issues that are still open
+        active_issues = self.get_active_issues()
         
-        print(f"🔮 Generated {len(predictions)} predictions")
-        print(f"📈 Found {len(anomaly_patterns)} anomaly patterns")
+        if self.state_path:
+            self.save_series_state()
         
         return {
             'success': True,
+            'parse_seconds': parse_seconds,
+            'new_points': new_points,
+            'series_updated': len(updated),
+            'series_tracked': len(self.series_state),
             'analyses_count': len(analyses),
             'top_issues_count': len(top_issues),
             'autonomous_actions': len(action_results),
             'top_issues': top_issues,
+            'active_issues': active_issues,
+            'active_issues_count': len(active_issues),
             'action_results': action_results,
             'predictions': predictions,
-            'capacity_recommendations': capacity_recommendations,
-            'anomaly_patterns': anomaly_patterns
-        }
\ No newline at end of file
+            'change_points': change_points
+        }
+
+def main():
+    """Stream NDJSON metrics through the monitoring agent from the command line"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Run the monitoring agent over NDJSON metric points")
+    parser.add_argument('source', help="NDJSON file with one metric point per line, or '-' for stdin")
+    parser.add_argument('--chunk-size', type=int, default=10000, help='Points per ingestion chunk')
+    parser.add_argument('--state-path', default=None,
+                        help='JSON file that series state and forecasters persist to between runs')
+    args = parser.parse_args()
+    
+    agent = AutonomousMonitoringAgent(state_path=args.state_path)
+    result = agent.run_streaming_analysis(args.source, args.chunk_size)
+    print(f"✅ Analyzed {result['analyses_count']} series, {result['top_issues_count']} top issues")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Scheduled Monitoring Daemon
+Runs incremental proactive analysis on an interval and publishes each result for the UI
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from .monitoring_agent import AutonomousMonitoringAgent, MetricsInput
+from ..data.monitoring_results import MonitoringResultStore
+from ..data.metrics_watcher import MetricsDirectoryWatcher
+
+class MonitoringDaemon:
+    """Asyncio loop that ticks the monitoring agent and keeps its series state between ticks"""
+
+    def __init__(self, agent: Optional[AutonomousMonitoringAgent] = None, interval_seconds: float = 300.0,
+                 result_store: Optional[MonitoringResultStore] = None,
+                 metrics_provider: Optional[Callable[[], MetricsInput]] = None,
+                 watcher: Optional[MetricsDirectoryWatcher] = None):
+        self.agent = agent or AutonomousMonitoringAgent()
+        self.interval_seconds = interval_seconds
+        self.result_store = result_store or MonitoringResultStore()
+
+        # Source of the current metrics snapshot (defaults to the same source as run_proactive_analysis)
+        self.metrics_provider = metrics_provider or self.agent.data_loader.load_prepared_metrics
+
+        # When set, ticks ingest only new/appended drop files instead of a full snapshot
+        self.watcher = watcher
+
+        self.ticks = 0
+        self.last_result = None
+        self._stop_event = None
+
+    def tick(self) -> Dict:
+        """Analyze points that arrived since the last tick and publish the result"""
+
+        if self.watcher is not None:
+            result = self.agent.run_ingested_analysis(self.watcher.poll())
+            # Files count as processed only once their points made it into the agent state
+            self.watcher.commit()
+        else:
+            result = self.agent.run_incremental_analysis(self.metrics_provider())
+        self.ticks += 1
+        self.result_store.publish(result, tick=self.ticks)
+        self.last_result = result
+        return result
+
+    async def run(self, max_ticks: Optional[int] = None):
+        """Tick every interval until stopped (or until max_ticks have run)"""
+
+        self._stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        print(f"🛰️ Monitoring daemon started (every {self.interval_seconds:g}s)")
+
+        while not self._stop_event.is_set():
+            try:
+                # Analysis is CPU-bound, so keep it off the event loop
+                result = await loop.run_in_executor(None, self.tick)
+                print(f"🕒 Tick {self.ticks} at {datetime.now():%H:%M:%S}: {result['new_points']} new points "
+                      f"in {result['series_updated']} series, {result['top_issues_count']} new top issues, "
+                      f"{result['active_issues_count']} active")
+            except Exception as e:
+                print(f"❌ Monitoring tick failed: {e}")
+
+            if max_ticks is not None and self.ticks >= max_ticks:
+                break
+
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+        print("🛑 Monitoring daemon stopped")
+
+    def stop(self):
+        """Ask the running loop to finish after the current tick"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+def main():
+    """Run the monitoring daemon from the command line"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run proactive monitoring on a schedule")
+    parser.add_argument('--interval', type=float, default=300.0, help='Seconds between ticks')
+    parser.add_argument('--max-ticks', type=int, default=None, help='Stop after this many ticks')
+    parser.add_argument('--state-path', default='data/monitoring_state.json',
+                        help='JSON file series state persists to between restarts')
+    parser.add_argument('--watch-dir', default=None,
+                        help='Ingest new and appended metric files from this directory (e.g. data/metrics)')
+    parser.add_argument('--results-path', default='data/monitoring_results.json',
+                        help='JSON file results are published to for the UI')
+    args = parser.parse_args()
+
+    daemon = MonitoringDaemon(
+        agent=AutonomousMonitoringAgent(state_path=args.state_path),
+        interval_seconds=args.interval,
+        result_store=MonitoringResultStore(args.results_path),
+        watcher=MetricsDirectoryWatcher(args.watch_dir) if args.watch_dir else None
+    )
+    try:
+        asyncio.run(daemon.run(max_ticks=args.max_ticks))
+    except KeyboardInterrupt:
+        print("🛑 Monitoring daemon interrupted")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Vectorized analytics engines used by the autonomous agents
\ No newline at end of file
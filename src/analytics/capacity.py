@@ -0,0 +1,122 @@
+"""
+Batched capacity planning
+Percentiles, growth rate and projected saturation for every series in one NumPy pass
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .regression import pad_windows
+from ..data.metric_store import from_epoch_micros
+
+MICROS_PER_DAY = 24 * 3600 * 1_000_000
+
+# Recommendation buckets, in priority order (same keys as generate_capacity_recommendations)
+CAPACITY_CATEGORIES = ['immediate_actions', 'short_term_planning', 'long_term_planning', 'cost_optimization']
+
+def capacity_metrics(timestamps: List[Sequence[int]], values: List[Sequence[float]],
+                     saturation_levels: Sequence[float]) -> Dict[str, np.ndarray]:
+    """Per-series capacity statistics, computed per length bucket so padding stays within 2x of the data"""
+
+    saturation_levels = np.asarray(saturation_levels, dtype=np.float64)
+    lengths = np.array([len(series_values) for series_values in values], dtype=np.int64)
+
+    # Series whose lengths share a power-of-two bucket are padded together
+    buckets = np.ceil(np.log2(np.maximum(lengths, 1))).astype(np.int64)
+    metrics: Dict[str, np.ndarray] = {}
+    for bucket in np.unique(buckets):
+        members = np.flatnonzero(buckets == bucket)
+        bucket_metrics = _padded_capacity_metrics([timestamps[i] for i in members],
+                                                  [values[i] for i in members],
+                                                  saturation_levels[members])
+        for name, column in bucket_metrics.items():
+            if name not in metrics:
+                metrics[name] = np.empty(len(lengths), dtype=column.dtype)
+            metrics[name][members] = column
+    return metrics
+
+def _padded_capacity_metrics(timestamps: List[Sequence[int]], values: List[Sequence[float]],
+                             saturation_levels: np.ndarray) -> Dict[str, np.ndarray]:
+    """Capacity statistics over NaN-padded matrices (one row per series)"""
+
+    value_matrix, lengths = pad_windows(values, fill_value=np.nan)
+    time_matrix, _ = pad_windows(timestamps, fill_value=np.nan)
+    rows = np.arange(len(lengths))
+    last = np.maximum(lengths - 1, 0)
+
+    p50, p95 = np.nanpercentile(value_matrix, [50, 95], axis=1)
+    current = value_matrix[rows, last]
+    last_timestamp = time_matrix[rows, last]
+
+    # Least-squares growth per day against real time, ignoring padding
+    days = (time_matrix - time_matrix[:, :1]) / MICROS_PER_DAY
+    present = ~np.isnan(value_matrix)
+    n = present.sum(axis=1)
+    sum_t = np.nansum(days, axis=1)
+    sum_v = np.nansum(value_matrix, axis=1)
+    sum_tt = np.nansum(days * days, axis=1)
+    sum_tv = np.nansum(days * value_matrix, axis=1)
+    denominator = n * sum_tt - sum_t ** 2
+    growth_per_day = np.divide(n * sum_tv - sum_t * sum_v, denominator,
+                               out=np.zeros(len(n)), where=denominator > 0)
+
+    # Days until the saturation level at the current growth rate (0 if already there, inf if not growing)
+    headroom = saturation_levels - current
+    days_to_saturation = np.full(len(n), np.inf)
+    growing = (growth_per_day > 0) & (headroom > 0)
+    days_to_saturation[growing] = headroom[growing] / growth_per_day[growing]
+    days_to_saturation[headroom <= 0] = 0.0
+
+    return {
+        'points': lengths,
+        'current': current,
+        'mean': sum_v / np.maximum(n, 1),
+        'p50': p50,
+        'p95': p95,
+        'max': np.nanmax(value_matrix, axis=1),
+        'growth_per_day': growth_per_day,
+        'days_to_saturation': days_to_saturation,
+        'saturation_timestamp': last_timestamp + days_to_saturation * MICROS_PER_DAY
+    }
+
+def capacity_categories(metrics: Dict[str, np.ndarray]) -> np.ndarray:
+    """Recommendation bucket per series ('' when no action is needed)"""
+    current, mean, maximum = metrics['current'], metrics['mean'], metrics['max']
+    return np.select(
+        [current > 90,
+         (current > 75) & (metrics['days_to_saturation'] <= 30),
+         mean > 60,
+         (maximum < 30) & (mean < 20)],
+        CAPACITY_CATEGORIES,
+        default=''
+    )
+
+def capacity_table(names: List[Sequence[str]], metrics: Dict[str, np.ndarray]) -> List[Dict]:
+    """Rows sorted by days to saturation (soonest first), then p95 (highest first)"""
+
+    categories = capacity_categories(metrics)
+    order = np.lexsort((-metrics['p95'], metrics['days_to_saturation']))
+
+    rows = []
+    for i in order.tolist():
+        metric_name, resource = names[i]
+        days = float(metrics['days_to_saturation'][i])
+        saturation_date = None
+        if np.isfinite(days):
+            saturation_date = from_epoch_micros(metrics['saturation_timestamp'][i]).isoformat()
+        rows.append({
+            'metric_name': metric_name,
+            'resource': resource,
+            'points': int(metrics['points'][i]),
+            'current': float(metrics['current'][i]),
+            'mean': float(metrics['mean'][i]),
+            'p50': float(metrics['p50'][i]),
+            'p95': float(metrics['p95'][i]),
+            'max': float(metrics['max'][i]),
+            'growth_per_day': float(metrics['growth_per_day'][i]),
+            'days_to_saturation': days,
+            'projected_saturation_date': saturation_date,
+            'category': str(categories[i])
+        })
+    return rows
@@ -0,0 +1,119 @@
+"""
+Online change-point detection
+Self-starting two-sided CUSUM, O(1) state per point, re-baselined after every detection
+"""
+
+from typing import Dict, Optional
+
+from .rolling_stats import RunningStats
+
+# Spread below this fraction of the level is floating-point noise, not a baseline to standardize against
+FLAT_TOLERANCE = 1e-9
+
+class CusumDetector:
+    """Flags sustained level shifts that are neither z-score outliers nor threshold breaches"""
+
+    def __init__(self, warmup: int = 30, drift: float = 0.5, threshold: float = 8.0):
+        self.warmup = warmup        # points used to learn the baseline mean/stdev
+        self.drift = drift          # slack per point, in baseline standard deviations
+        self.threshold = threshold  # decision interval, in baseline standard deviations
+
+        self.baseline = RunningStats()
+        self.positive_sum = 0.0
+        self.negative_sum = 0.0
+        self.positive_run = 0
+        self.negative_run = 0
+        self.positive_start: Optional[int] = None
+        self.negative_start: Optional[int] = None
+
+    @property
+    def warmed_up(self) -> bool:
+        return self.baseline.count >= self.warmup
+
+    def update(self, timestamp: int, value: float) -> Optional[Dict]:
+        """Apply one point; returns a change point when a shift is confirmed"""
+
+        if not self.warmed_up:
+            self.baseline.update(value)
+            return None
+
+        mean = self.baseline.mean
+        stdev = self.baseline.stdev
+        tolerance = FLAT_TOLERANCE * max(1.0, abs(mean))
+        if stdev <= tolerance:
+            # A flat baseline can't be standardized; any real departure restarts learning
+            if abs(value - mean) > tolerance:
+                self._rebaseline(value)
+            return None
+
+        # Self-starting: each point is standardized against the segment before it, then joins it
+        z = (value - mean) / stdev
+        self.positive_sum = max(0.0, self.positive_sum + z - self.drift)
+        self.negative_sum = max(0.0, self.negative_sum - z - self.drift)
+        self.positive_run = self.positive_run + 1 if self.positive_sum > 0 else 0
+        self.negative_run = self.negative_run + 1 if self.negative_sum > 0 else 0
+        # Where each side's current run began, i.e. the estimated onset of the shift
+        self.positive_start = None if not self.positive_run else (
+            timestamp if self.positive_run == 1 else self.positive_start)
+        self.negative_start = None if not self.negative_run else (
+            timestamp if self.negative_run == 1 else self.negative_start)
+
+        if self.positive_sum <= self.threshold and self.negative_sum <= self.threshold:
+            self.baseline.update(value)
+            return None
+
+        # Standard CUSUM estimate of the new level from the accumulated sum and run length
+        if self.positive_sum > self.threshold:
+            direction, started_at = 'increase', self.positive_start
+            shift = self.drift + self.positive_sum / self.positive_run
+        else:
+            direction, started_at = 'decrease', self.negative_start
+            shift = -(self.drift + self.negative_sum / self.negative_run)
+
+        change_point = {
+            'timestamp': timestamp,
+            'started_at': started_at,
+            'direction': direction,
+            'baseline_mean': mean,
+            'baseline_stdev': stdev,
+            'new_level': mean + shift * stdev,
+            'shift_sigmas': shift
+        }
+        self._rebaseline(value)
+        return change_point
+
+    def _rebaseline(self, value: float):
+        """Start learning a new baseline from the shifted level"""
+        self.baseline = RunningStats()
+        self.baseline.update(value)
+        self.positive_sum = self.negative_sum = 0.0
+        self.positive_run = self.negative_run = 0
+        self.positive_start = self.negative_start = None
+
+    def to_dict(self) -> Dict:
+        """Serialize state for persistence between runs"""
+        return {
+            'warmup': self.warmup,
+            'drift': self.drift,
+            'threshold': self.threshold,
+            'baseline': self.baseline.to_dict(),
+            'positive_sum': self.positive_sum,
+            'negative_sum': self.negative_sum,
+            'positive_run': self.positive_run,
+            'negative_run': self.negative_run,
+            'positive_start': self.positive_start,
+            'negative_start': self.negative_start
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CusumDetector':
+        """Restore state saved by to_dict"""
+        detector = cls(warmup=data['warmup'], drift=data['drift'], threshold=data['threshold'])
+        detector.baseline = RunningStats.from_dict(data['baseline'])
+        detector.positive_sum = data['positive_sum']
+        detector.negative_sum = data['negative_sum']
+        detector.positive_run = data['positive_run']
+        detector.negative_run = data['negative_run']
+        detector.positive_start = data['positive_start']
+        detector.negative_start = data['negative_start']
+        return detector
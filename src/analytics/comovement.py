@@ -0,0 +1,120 @@
+"""
+Cross-metric co-movement
+Lagged Pearson correlations between every pair of series on a shared grid, in one tensor operation
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .periodicity import grid_step
+
+# Overlap (grid points) each lagged correlation must be computed over
+MIN_OVERLAP = 8
+
+# A lag only counts as a lead if it beats the zero-lag correlation by this much
+# (smooth trends correlate almost equally at every lag)
+LEAD_MARGIN = 0.05
+
+def align_series(series: Sequence[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, int]:
+    """Bucket means of every series on one grid over their common time range, gaps carried forward
+
+    Returns (matrix with one row per series, grid step in microseconds).
+    """
+    step = max(grid_step(np.asarray(timestamps)) for timestamps, _ in series)
+    start = max(int(timestamps[0]) for timestamps, _ in series)
+    end = min(int(timestamps[-1]) for timestamps, _ in series)
+    if end <= start:
+        return np.empty((len(series), 0)), step
+
+    length = (end - start) // step + 1
+    matrix = np.full((len(series), length), np.nan)
+    for row, (timestamps, values) in enumerate(series):
+        timestamps, values = np.asarray(timestamps), np.asarray(values, dtype=np.float64)
+        inside = (timestamps >= start) & (timestamps <= end)
+        bins = (timestamps[inside] - start) // step
+        sums = np.bincount(bins, weights=values[inside], minlength=length)
+        counts = np.bincount(bins, minlength=length)
+        matrix[row, counts > 0] = sums[counts > 0] / counts[counts > 0]
+
+    # Forward-fill empty buckets, then back-fill any leading ones from the first real value
+    present = ~np.isnan(matrix)
+    last_seen = np.maximum.accumulate(np.where(present, np.arange(length), 0), axis=1)
+    matrix = matrix[np.arange(len(series))[:, None], last_seen]
+    first_value = matrix[np.arange(len(series)), present.argmax(axis=1)]
+    return np.where(np.isnan(matrix), first_value[:, None], matrix), step
+
+def lagged_correlations(matrix: np.ndarray, max_lag: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Pearson correlation of every row pair at every lag in [-max_lag, max_lag]
+
+    Returns (lags, correlations) where correlations[k, i, j] correlates row i at time t
+    with row j at time t + lags[k]; a peak at a positive lag means row i moves first.
+    """
+    rows, length = matrix.shape
+    max_lag = max(0, min(max_lag, (length - MIN_OVERLAP) // 2))
+    lags = np.arange(-max_lag, max_lag + 1)
+    width = length - 2 * max_lag
+    if width < 2:
+        return lags, np.zeros((len(lags), rows, rows))
+
+    # windows[i, k] is row i shifted by lags[k]; the unshifted window is the reference
+    windows = sliding_window_view(matrix, width, axis=1)
+    centered = windows - windows.mean(axis=2, keepdims=True)
+    norms = np.sqrt((centered ** 2).sum(axis=2))
+    standardized = np.divide(centered, norms[..., None], out=np.zeros_like(centered), where=norms[..., None] > 0)
+
+    correlations = np.einsum('iw,jkw->kij', standardized[:, max_lag], standardized)
+    return lags, correlations
+
+def comoving_groups(lags: np.ndarray, correlations: np.ndarray, candidates: Sequence[int],
+                    min_correlation: float = 0.7) -> List[Dict]:
+    """Group candidate rows whose best lagged correlation reaches `min_correlation`
+
+    Each group reports its members, the leading member (None when they move together)
+    and how many grid steps it leads the others by.
+    """
+    candidates = list(candidates)
+    if len(candidates) < 2:
+        return []
+
+    subset = correlations[:, candidates][:, :, candidates]
+    best = subset.argmax(axis=0)
+    best_correlation = subset.max(axis=0)
+    zero_lag = subset[len(lags) // 2]
+    best_lag = np.where(best_correlation - zero_lag >= LEAD_MARGIN, lags[best], 0)
+    linked = best_correlation >= min_correlation
+    np.fill_diagonal(linked, False)
+
+    # Connected components over the correlation links
+    labels = list(range(len(candidates)))
+    def root(i):
+        while labels[i] != i:
+            labels[i] = labels[labels[i]]
+            i = labels[i]
+        return i
+    for i, j in zip(*np.nonzero(linked)):
+        labels[root(i)] = root(j)
+
+    components: Dict[int, List[int]] = {}
+    for i in range(len(candidates)):
+        components.setdefault(root(i), []).append(i)
+
+    groups = []
+    for members in components.values():
+        if len(members) < 2:
+            continue
+        member_index = np.array(members)
+        # Positive best lag for (i, j) means i moves first; the leader is ahead of the rest overall
+        lead_scores = best_lag[np.ix_(member_index, member_index)].sum(axis=1)
+        leader = int(member_index[np.argmax(lead_scores)])
+        others = member_index[member_index != leader]
+        lead_steps = int(np.median(best_lag[leader, others]))
+        pair_correlations = best_correlation[np.ix_(member_index, member_index)]
+        groups.append({
+            'members': [candidates[i] for i in members],
+            'leader': candidates[leader] if lead_steps > 0 else None,
+            'lead_steps': max(lead_steps, 0),
+            'correlation': float(pair_correlations[~np.eye(len(members), dtype=bool)].mean())
+        })
+    return groups
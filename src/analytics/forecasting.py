@@ -0,0 +1,154 @@
+"""
+Seasonal forecasting
+Additive Holt-Winters (level, trend, daily season) updated incrementally one point at a time
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+MICROS_PER_DAY = 24 * 3600 * 1_000_000
+
+# Upper bound on seasonal slots kept per series (one day of 1-minute samples)
+MAX_SEASON_LENGTH = 1440
+
+class HoltWintersForecaster:
+    """Additive Holt-Winters with a season length inferred from the sampling interval"""
+
+    def __init__(self, alpha: float = 0.3, beta: float = 0.05, gamma: float = 0.2,
+                 min_seasons: int = 2):
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.min_seasons = min_seasons
+
+        self.season_length = 0
+        self.interval_micros = 0
+        self.level = 0.0
+        self.trend = 0.0
+        self.seasonals: List[float] = []
+        self.season_index = 0
+        self.points_seen = 0
+
+        # Points buffered until one full season is available to initialize from
+        self._warmup_timestamps: List[int] = []
+        self._warmup_values: List[float] = []
+        # Buffer size at which the season length is next re-estimated
+        self._warmup_target = 2
+
+    @property
+    def initialized(self) -> bool:
+        return bool(self.seasonals)
+
+    @property
+    def is_ready(self) -> bool:
+        """Forecasts are trusted once enough full seasons have been observed"""
+        return self.initialized and self.points_seen >= self.min_seasons * self.season_length
+
+    def update(self, timestamp: int, value: float):
+        """Apply one new point in O(1)"""
+        value = float(value)
+        self.points_seen += 1
+
+        if not self.initialized:
+            self._warmup_timestamps.append(int(timestamp))
+            self._warmup_values.append(value)
+            self._try_initialize()
+            return
+
+        seasonal = self.seasonals[self.season_index]
+        previous_level = self.level
+        self.level = self.alpha * (value - seasonal) + (1 - self.alpha) * (self.level + self.trend)
+        self.trend = self.beta * (self.level - previous_level) + (1 - self.beta) * self.trend
+        self.seasonals[self.season_index] = self.gamma * (value - self.level) + (1 - self.gamma) * seasonal
+        self.season_index = (self.season_index + 1) % self.season_length
+
+    def update_many(self, timestamps: np.ndarray, values: np.ndarray):
+        """Apply a batch of new points in order"""
+        for timestamp, value in zip(timestamps.tolist(), values.tolist()):
+            self.update(timestamp, value)
+
+    def _try_initialize(self):
+        """Seed level and seasonal offsets from the first full season"""
+        # Re-estimating the interval is O(buffer), so it only happens at the target size
+        if len(self._warmup_values) < self._warmup_target:
+            return
+
+        interval = int(np.median(np.diff(self._warmup_timestamps)))
+        if interval <= 0:
+            return
+        season_length = min(MAX_SEASON_LENGTH, max(1, round(MICROS_PER_DAY / interval)))
+        if len(self._warmup_values) < season_length:
+            # Doubling bounds the re-estimates to O(log n) while the interval estimate settles
+            self._warmup_target = min(season_length, 2 * len(self._warmup_values))
+            return
+
+        season = np.array(self._warmup_values[-season_length:])
+        self.interval_micros = interval
+        self.season_length = season_length
+        self.level = float(season.mean())
+        self.trend = 0.0
+        self.seasonals = (season - self.level).tolist()
+        self.season_index = 0
+        self._warmup_timestamps, self._warmup_values = [], []
+
+    def deseasonalize(self, value: float) -> float:
+        """The next point with its seasonal offset removed (NaN until the first season is learned)"""
+        if not self.initialized:
+            return float('nan')
+        return float(value) - self.seasonals[self.season_index]
+
+    def forecast(self, steps: int) -> float:
+        """Forecast the value `steps` intervals after the last point, in O(1)"""
+        if not self.initialized:
+            return float('nan')
+        seasonal = self.seasonals[(self.season_index + steps - 1) % self.season_length]
+        return self.level + steps * self.trend + seasonal
+
+    def forecast_path(self, steps: int) -> np.ndarray:
+        """Forecasts for 1..steps intervals ahead"""
+        if not self.initialized or steps < 1:
+            return np.empty(0)
+        horizon = np.arange(1, steps + 1)
+        seasonals = np.asarray(self.seasonals)[(self.season_index + horizon - 1) % self.season_length]
+        return self.level + horizon * self.trend + seasonals
+
+    def steps_for_hours(self, hours: float) -> int:
+        """Number of sampling intervals covering the given number of hours"""
+        if not self.interval_micros:
+            return 0
+        return max(1, round(hours * 3600 * 1_000_000 / self.interval_micros))
+
+    def to_dict(self) -> Dict:
+        """Serialize state for persistence between runs"""
+        return {
+            'alpha': self.alpha,
+            'beta': self.beta,
+            'gamma': self.gamma,
+            'min_seasons': self.min_seasons,
+            'season_length': self.season_length,
+            'interval_micros': self.interval_micros,
+            'level': self.level,
+            'trend': self.trend,
+            'seasonals': self.seasonals,
+            'season_index': self.season_index,
+            'points_seen': self.points_seen,
+            'warmup_timestamps': self._warmup_timestamps,
+            'warmup_values': self._warmup_values
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'HoltWintersForecaster':
+        """Restore state saved by to_dict"""
+        forecaster = cls(alpha=data['alpha'], beta=data['beta'], gamma=data['gamma'],
+                         min_seasons=data.get('min_seasons', 2))
+        forecaster.season_length = data['season_length']
+        forecaster.interval_micros = data['interval_micros']
+        forecaster.level = data['level']
+        forecaster.trend = data['trend']
+        forecaster.seasonals = list(data['seasonals'])
+        forecaster.season_index = data['season_index']
+        forecaster.points_seen = data['points_seen']
+        forecaster._warmup_timestamps = list(data.get('warmup_timestamps') or [])
+        forecaster._warmup_values = list(data.get('warmup_values') or [])
+        return forecaster
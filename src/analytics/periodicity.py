@@ -0,0 +1,127 @@
+"""
+Periodicity detection
+Resample spike indicators to a regular grid and find dominant periods with FFT autocorrelation
+"""
+
+from datetime import timedelta
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..data.metric_store import from_epoch_micros
+
+MICROS_PER_MINUTE = 60 * 1_000_000
+MICROS_PER_HOUR = 60 * MICROS_PER_MINUTE
+MICROS_PER_DAY = 24 * MICROS_PER_HOUR
+MICROS_PER_WEEK = 7 * MICROS_PER_DAY
+
+# Named schedules and the relative tolerance for matching a detected period to them
+NAMED_PERIODS = [('hourly', MICROS_PER_HOUR), ('daily', MICROS_PER_DAY), ('weekly', MICROS_PER_WEEK)]
+PERIOD_TOLERANCE = 0.05
+
+# Grid size cap per series; long histories get a coarser step instead of a longer FFT
+MAX_GRID_POINTS = 16384
+
+def grid_step(timestamps: np.ndarray) -> int:
+    """Resampling step: the median sampling interval, coarsened to cap the grid size"""
+    if len(timestamps) < 2:
+        return MICROS_PER_MINUTE
+    median_interval = int(np.median(np.diff(timestamps)))
+    span = int(timestamps[-1] - timestamps[0])
+    return max(median_interval, MICROS_PER_MINUTE, -(-span // MAX_GRID_POINTS))
+
+def spike_grid(timestamps: np.ndarray, spike_mask: np.ndarray, step: int) -> np.ndarray:
+    """1.0 in every grid cell that contains at least one spike, else 0.0"""
+    bins = (timestamps - timestamps[0]) // step
+    grid = np.zeros(int(bins[-1]) + 1)
+    grid[bins[spike_mask]] = 1.0
+    return grid
+
+def batch_autocorrelation(grids: List[np.ndarray]) -> List[np.ndarray]:
+    """Normalized autocorrelation of every grid (zero-padded, no wraparound), one row per grid
+
+    Grids sharing a power-of-two FFT length are transformed in one batch, so memory follows
+    each grid's own length rather than the longest one.
+    """
+
+    buckets: Dict[int, List[int]] = {}
+    for row, grid in enumerate(grids):
+        buckets.setdefault(1 << int(2 * len(grid) - 1).bit_length(), []).append(row)
+
+    results: List[Optional[np.ndarray]] = [None] * len(grids)
+    for fft_length, rows in buckets.items():
+        signals = np.zeros((len(rows), fft_length))
+        for i, row in enumerate(rows):
+            signals[i, :len(grids[row])] = grids[row] - grids[row].mean()
+
+        spectrum = np.fft.rfft(signals, axis=1)
+        autocorrelation = np.fft.irfft(spectrum * np.conj(spectrum), n=fft_length, axis=1)
+        variance = autocorrelation[:, :1]
+        normalized = np.divide(autocorrelation, variance, out=np.zeros_like(autocorrelation), where=variance > 0)
+        for i, row in enumerate(rows):
+            results[row] = normalized[i]
+    return results
+
+def dominant_lag(autocorrelation: np.ndarray, length: int, min_strength: float,
+                 min_cycles: int = 2) -> Optional[int]:
+    """Strongest local autocorrelation peak seen at least `min_cycles` times in the data"""
+    max_lag = length // min_cycles
+    if max_lag < 3:
+        return None
+
+    window = autocorrelation[:max_lag + 2]
+    lags = np.arange(2, max_lag + 1)
+    peaks = lags[(window[lags] >= window[lags - 1]) & (window[lags] >= window[lags + 1]) &
+                 (window[lags] >= min_strength)]
+    if not len(peaks):
+        return None
+    return int(peaks[np.argmax(window[peaks])])
+
+def label_period(period_micros: int) -> str:
+    """'hourly', 'daily', 'weekly' or a custom 'every ...' label"""
+    for name, micros in NAMED_PERIODS:
+        if abs(period_micros - micros) <= PERIOD_TOLERANCE * micros:
+            return name
+    return f"every {timedelta(microseconds=int(period_micros))}"
+
+def schedule_description(label: str, spike_timestamps: np.ndarray, period_micros: int) -> str:
+    """Human-readable spike schedule from the most common phase within the period"""
+    phases = (spike_timestamps % period_micros) // MICROS_PER_MINUTE
+    values, counts = np.unique(phases, return_counts=True)
+    typical = from_epoch_micros(int(values[np.argmax(counts)]) * MICROS_PER_MINUTE)
+
+    if label == 'hourly':
+        return f"every hour at :{typical.minute:02d}"
+    if label == 'daily':
+        return f"every day around {typical:%H:%M}"
+    if label == 'weekly':
+        # Epoch day 0 was a Thursday
+        weekday = ['Thu', 'Fri', 'Sat', 'Sun', 'Mon', 'Tue', 'Wed'][(typical - from_epoch_micros(0)).days % 7]
+        return f"every {weekday} around {typical:%H:%M}"
+    return label
+
+def detect_spike_periods(series: Sequence[Sequence[np.ndarray]], min_strength: float = 0.3) -> List[Optional[Dict]]:
+    """Dominant spike period for each (timestamps, spike_mask) pair, all in one FFT batch"""
+
+    steps = [grid_step(timestamps) for timestamps, _ in series]
+    grids = [spike_grid(timestamps, spike_mask, step) for (timestamps, spike_mask), step in zip(series, steps)]
+    if not grids:
+        return []
+
+    autocorrelation = batch_autocorrelation(grids)
+    results = []
+    for row, ((timestamps, spike_mask), step, grid) in enumerate(zip(series, steps, grids)):
+        lag = dominant_lag(autocorrelation[row], len(grid), min_strength)
+        if lag is None:
+            results.append(None)
+            continue
+
+        period_micros = lag * step
+        label = label_period(period_micros)
+        results.append({
+            'period_label': label,
+            'period_seconds': period_micros / 1_000_000,
+            'strength': float(autocorrelation[row][lag]),
+            'schedule': schedule_description(label, timestamps[spike_mask], period_micros)
+        })
+    return results
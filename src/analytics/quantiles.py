@@ -0,0 +1,131 @@
+"""
+Mergeable quantile sketches
+DDSketch-style log-bucketed counts: O(1) per point, bounded relative error, exact merges
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+class QuantileSketch:
+    """Quantile sketch with relative accuracy `relative_accuracy` on every returned value"""
+
+    def __init__(self, relative_accuracy: float = 0.005):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        # Bucket index -> count, kept separately for positive and negative values
+        self.positive = defaultdict(int)
+        self.negative = defaultdict(int)
+        self.zero_count = 0
+        self.count = 0
+
+    def _key(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        """Representative value of a bucket (midpoint in relative terms)"""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float):
+        """Add one point in O(1)"""
+        self.count += 1
+        if value > 0:
+            self.positive[self._key(value)] += 1
+        elif value < 0:
+            self.negative[self._key(-value)] += 1
+        else:
+            self.zero_count += 1
+
+    def add_many(self, values: Iterable[float]):
+        """Add a batch of points with one vectorized bucketing pass"""
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+
+        self.count += len(values)
+        self.zero_count += int((values == 0).sum())
+        for store, magnitudes in ((self.positive, values[values > 0]), (self.negative, -values[values < 0])):
+            if len(magnitudes):
+                keys, counts = np.unique(np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64),
+                                         return_counts=True)
+                for key, count in zip(keys.tolist(), counts.tolist()):
+                    store[key] += count
+
+    def merge(self, other: 'QuantileSketch'):
+        """Fold another sketch (same accuracy) into this one exactly"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge quantile sketches with different relative accuracy")
+        for key, count in other.positive.items():
+            self.positive[key] += count
+        for key, count in other.negative.items():
+            self.negative[key] += count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def _buckets(self) -> List[Tuple[float, int]]:
+        """(representative value, count) for every bucket in ascending value order"""
+        buckets = [(-self._value(key), self.negative[key]) for key in sorted(self.negative, reverse=True)]
+        if self.zero_count:
+            buckets.append((0.0, self.zero_count))
+        buckets.extend((self._value(key), self.positive[key]) for key in sorted(self.positive))
+        return buckets
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (0 <= q <= 1)"""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """Several quantiles from one pass over the buckets"""
+        qs = list(qs)
+        if not self.count:
+            return [float('nan')] * len(qs)
+
+        values, counts = zip(*self._buckets())
+        cumulative = np.cumsum(counts)
+        ranks = np.array([q * (self.count - 1) for q in qs])
+        indices = np.searchsorted(cumulative, ranks, side='right')
+        return [float(values[min(i, len(values) - 1)]) for i in indices]
+
+    def median_absolute_deviation(self) -> float:
+        """MAD estimated from bucket representatives around the sketch median"""
+        if not self.count:
+            return float('nan')
+
+        median = self.quantile(0.5)
+        values, counts = zip(*self._buckets())
+        deviations = np.abs(np.array(values) - median)
+        order = np.argsort(deviations, kind='stable')
+        cumulative = np.cumsum(np.array(counts)[order])
+        index = int(np.searchsorted(cumulative, 0.5 * (self.count - 1), side='right'))
+        return float(deviations[order][min(index, len(order) - 1)])
+
+    def to_dict(self) -> Dict:
+        """Serialize for persistence"""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'positive': {str(key): count for key, count in self.positive.items()},
+            'negative': {str(key): count for key, count in self.negative.items()},
+            'zero_count': self.zero_count,
+            'count': self.count
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'QuantileSketch':
+        """Restore a sketch saved by to_dict"""
+        sketch = cls(relative_accuracy=data['relative_accuracy'])
+        sketch.positive.update({int(key): count for key, count in data['positive'].items()})
+        sketch.negative.update({int(key): count for key, count in data['negative'].items()})
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        return sketch
+
+def merge_sketches(sketches: Iterable[QuantileSketch], relative_accuracy: float = 0.005) -> QuantileSketch:
+    """Merge many sketches (e.g. one per resource) into a fleet-level sketch"""
+    merged = QuantileSketch(relative_accuracy)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
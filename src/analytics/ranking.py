@@ -0,0 +1,27 @@
+"""
+Top-N ranking
+Partial selection over score arrays so fleet-wide ranking never sorts every series
+"""
+
+import numpy as np
+
+def top_n_indices(scores: np.ndarray, n: int) -> np.ndarray:
+    """Indices of the `n` highest finite scores, highest first
+
+    Ties keep their original order, matching a stable descending sort of the whole array.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    finite = int(np.isfinite(scores).sum())
+    n = min(n, finite)
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    if n < len(scores):
+        # O(len) selection of the n-th highest score, then every index tied with it or above
+        partitioned = np.argpartition(-scores, n - 1)[:n]
+        candidates = np.flatnonzero(scores >= scores[partitioned].min())
+    else:
+        candidates = np.flatnonzero(np.isfinite(scores))
+
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order[:n]]
@@ -0,0 +1,77 @@
+"""
+Batched least-squares regression
+Slope, intercept, projection and time-to-threshold for many short series in one NumPy pass
+"""
+
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+def pad_windows(windows: List[Sequence[float]], fill_value: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack ragged windows into a left-aligned, padded matrix plus row lengths"""
+
+    lengths = np.array([len(window) for window in windows], dtype=np.int64)
+    width = int(lengths.max()) if len(lengths) else 0
+    padded = np.full((len(windows), width), fill_value, dtype=np.float64)
+
+    if lengths.sum():
+        flat = np.concatenate([np.asarray(window, dtype=np.float64) for window in windows])
+        rows = np.repeat(np.arange(len(windows)), lengths)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        cols = np.arange(len(flat)) - np.repeat(starts, lengths)
+        padded[rows, cols] = flat
+
+    return padded, lengths
+
+def batched_linear_fit(padded: np.ndarray, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Least-squares slope and intercept per row, with x = 0..n-1
+
+    Sums are accumulated column by column so every row adds its terms in the same
+    order as a sequential Python sum(), which keeps results bit-identical to the
+    scalar formula: slope = (n*Sxy - Sx*Sy) / (n*Sxx - Sx**2).
+    """
+    rows, width = padded.shape
+    n = lengths.astype(np.float64)
+
+    sum_x = np.zeros(rows)
+    sum_y = np.zeros(rows)
+    sum_xy = np.zeros(rows)
+    sum_xx = np.zeros(rows)
+    for col in range(width):
+        active = col < lengths
+        y = np.where(active, padded[:, col], 0.0)
+        x = np.where(active, float(col), 0.0)
+        sum_x += x
+        sum_y += y
+        sum_xy += x * y
+        sum_xx += x * x
+
+    denominator = n * sum_xx - sum_x ** 2
+    slope = np.divide(n * sum_xy - sum_x * sum_y, denominator,
+                      out=np.zeros(rows), where=denominator != 0)
+    intercept = np.divide(sum_y - slope * sum_x, n, out=np.zeros(rows), where=n > 0)
+
+    return slope, intercept
+
+def batched_trend_projection(windows: List[Sequence[float]], horizon: float,
+                             thresholds: Union[float, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Fit every window and project `horizon` steps past its end
+
+    time_to_threshold is measured in steps from the last point and is inf for
+    series that are flat or falling.
+    """
+    padded, lengths = pad_windows(windows)
+    slope, intercept = batched_linear_fit(padded, lengths)
+    thresholds = np.broadcast_to(np.asarray(thresholds, dtype=np.float64), slope.shape)
+
+    rising = slope > 0
+    threshold_x = np.divide(thresholds - intercept, slope, out=np.zeros(len(slope)), where=rising)
+    time_to_threshold = np.where(rising, np.maximum(0, threshold_x - (lengths - 1)), np.inf)
+
+    return {
+        'slope': slope,
+        'intercept': intercept,
+        'projected_value': slope * (lengths + horizon) + intercept,
+        'time_to_threshold': time_to_threshold,
+        'lengths': lengths
+    }
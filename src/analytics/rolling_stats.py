@@ -0,0 +1,100 @@
+"""
+Streaming rolling statistics
+Welford running mean/variance updated in O(1) per point, with an optional sliding window
+"""
+
+import math
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+class RunningStats:
+    """Running count, mean and variance (Welford), optionally over the last N points"""
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = window
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._window_values = deque() if window else None
+
+    def update(self, value: float):
+        """Add one point, evicting the oldest point when the window is full"""
+        value = float(value)
+
+        if self._window_values is not None:
+            if len(self._window_values) == self.window:
+                self._remove(self._window_values.popleft())
+            self._window_values.append(value)
+
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def update_many(self, values: Iterable[float]):
+        """Add many points; unwindowed batches are merged in one vectorized step"""
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+
+        if self._window_values is not None:
+            for value in values:
+                self.update(value)
+            return
+
+        # Chan et al. parallel merge of (count, mean, M2)
+        batch_count = len(values)
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        self._m2 += batch_m2 + delta * delta * self.count * batch_count / total
+        self.mean += delta * batch_count / total
+        self.count = total
+
+    def _remove(self, value: float):
+        """Reverse Welford step for a point leaving the window"""
+        if self.count <= 1:
+            self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            return
+
+        self.count -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self._m2 -= delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1), matching statistics.variance"""
+        if self.count < 2:
+            return 0.0
+        return max(0.0, self._m2 / (self.count - 1))
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation, matching statistics.stdev"""
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict:
+        """Serialize state for checkpointing"""
+        return {
+            'window': self.window,
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self._m2,
+            'window_values': list(self._window_values) if self._window_values is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RunningStats':
+        """Restore state from a checkpoint"""
+        stats = cls(window=data.get('window'))
+        stats.count = data['count']
+        stats.mean = data['mean']
+        stats._m2 = data['m2']
+        if stats._window_values is not None:
+            stats._window_values.extend(data.get('window_values') or [])
+        return stats
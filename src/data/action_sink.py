@@ -0,0 +1,98 @@
+"""
+Pluggable sinks for agent action updates
+Each sink applies a batch of updates as a single all-or-nothing transaction
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List
+
+class ActionSink(ABC):
+    """Destination for batched agent updates (ticketing system, database, file)"""
+
+    @abstractmethod
+    def apply(self, updates: List[Dict]):
+        """Apply all updates atomically, or none of them"""
+
+class JsonFileActionSink(ActionSink):
+    """Appends updates to a local JSON file, replacing it atomically (for testing)"""
+
+    def __init__(self, file_path: str = "data/action_updates.json"):
+        self.file_path = Path(file_path)
+
+    def apply(self, updates: List[Dict]):
+        """Append updates by rewriting the file and swapping it into place"""
+
+        existing = []
+        if self.file_path.exists():
+            with open(self.file_path, 'r') as f:
+                existing = json.load(f)
+
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.file_path.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(existing + updates, f, indent=2, default=str)
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load_updates(self) -> List[Dict]:
+        """Read back every update applied so far"""
+        if not self.file_path.exists():
+            return []
+        with open(self.file_path, 'r') as f:
+            return json.load(f)
+
+class SQLiteActionSink(ActionSink):
+    """Stores updates in a local SQLite table (for testing)"""
+
+    def __init__(self, db_path: str = "data/action_updates.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_path))
+
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS action_updates (
+                    update_id TEXT PRIMARY KEY,
+                    action TEXT NOT NULL,
+                    incident_ids TEXT NOT NULL,
+                    details TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            """)
+
+    def apply(self, updates: List[Dict]):
+        """Insert all updates in one transaction (a duplicate id rolls back the batch)"""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO action_updates (update_id, action, incident_ids, details, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(update['update_id'], update['action'], json.dumps(update['incident_ids']),
+                  json.dumps(update['details'], default=str), str(update['created_at']))
+                 for update in updates]
+            )
+
+    def load_updates(self) -> List[Dict]:
+        """Read back every update applied so far"""
+        rows = self.connection.execute(
+            "SELECT update_id, action, incident_ids, details, created_at FROM action_updates "
+            "ORDER BY rowid"
+        ).fetchall()
+        return [{
+            'update_id': update_id,
+            'action': action,
+            'incident_ids': json.loads(incident_ids),
+            'details': json.loads(details),
+            'created_at': created_at
+        } for update_id, action, incident_ids, details, created_at in rows]
+
+    def close(self):
+        """Close the underlying database connection"""
+        self.connection.close()
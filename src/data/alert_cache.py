@@ -0,0 +1,85 @@
+"""
+Active alert cache
+Deduplicates repeat detections by fingerprint so one ongoing problem raises one alert
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+@dataclass
+class ActiveAlert:
+    """An alert that is still being detected"""
+    fingerprint: str
+    alert_id: str
+    first_seen: datetime
+    last_seen: datetime
+    occurrence_count: int = 1
+    last_notified: Optional[datetime] = None
+    suppressed_actions: int = 0
+
+class AlertCache:
+    """Fingerprint-keyed active alerts with a TTL and a re-notify interval"""
+
+    def __init__(self, ttl_seconds: float = 1800, renotify_seconds: float = 4 * 3600):
+        # An alert not seen again within the TTL expires; the next detection is a new alert
+        self.ttl = timedelta(seconds=ttl_seconds)
+        # Actions for a still-active alert are repeated at most once per interval
+        self.renotify_interval = timedelta(seconds=renotify_seconds)
+
+        self.alerts: Dict[str, ActiveAlert] = {}
+        self.deduplicated = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(metric_name: str, resource: str, severity_band: str) -> str:
+        return f"{metric_name}|{resource}|{severity_band}"
+
+    def observe(self, fingerprint: str, alert_id: str, now: Optional[datetime] = None) -> Tuple[ActiveAlert, bool]:
+        """Record a detection; returns (alert, is_new). Repeats keep the original alert id"""
+        now = now or datetime.now()
+
+        with self._lock:
+            alert = self.alerts.get(fingerprint)
+            if alert is not None and now - alert.last_seen <= self.ttl:
+                alert.last_seen = now
+                alert.occurrence_count += 1
+                self.deduplicated += 1
+                return alert, False
+
+            alert = self.alerts[fingerprint] = ActiveAlert(
+                fingerprint=fingerprint, alert_id=alert_id, first_seen=now, last_seen=now
+            )
+            return alert, True
+
+    def should_notify(self, fingerprint: str, now: Optional[datetime] = None) -> bool:
+        """Claim the right to act on an alert; False while within the re-notify interval"""
+        now = now or datetime.now()
+
+        with self._lock:
+            alert = self.alerts.get(fingerprint)
+            if alert is None:
+                return True
+            if alert.last_notified is not None and now - alert.last_notified < self.renotify_interval:
+                alert.suppressed_actions += 1
+                return False
+            alert.last_notified = now
+            return True
+
+    def expire(self, now: Optional[datetime] = None) -> int:
+        """Drop alerts not seen within the TTL; returns how many were removed"""
+        now = now or datetime.now()
+
+        with self._lock:
+            stale = [fingerprint for fingerprint, alert in self.alerts.items() if now - alert.last_seen > self.ttl]
+            for fingerprint in stale:
+                del self.alerts[fingerprint]
+            return len(stale)
+
+    def get_stats(self) -> Dict:
+        return {
+            'active_alerts': len(self.alerts),
+            'deduplicated_detections': self.deduplicated,
+            'suppressed_actions': sum(alert.suppressed_actions for alert in self.alerts.values())
+        }
@@ -0,0 +1,58 @@
+"""
+Metric analysis cache
+Bounded LRU of per-series analyses keyed by the series content and the settings that produced them
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+class AnalysisCache:
+    """Least-recently-used cache that reports hit and miss counts"""
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(metric_name: str, resource: str, last_timestamp: Optional[int], points_seen: int,
+            settings: tuple) -> tuple:
+        """Series content is identified by its newest timestamp and point count (state is append-only)"""
+        return (metric_name, resource, last_timestamp, points_seen, settings)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def get_stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'analysis_cache_entries': len(self.entries),
+            'analysis_cache_hits': self.hits,
+            'analysis_cache_misses': self.misses,
+            'analysis_cache_hit_rate': self.hits / lookups if lookups else 0.0,
+            'analysis_cache_evictions': self.evictions
+        }
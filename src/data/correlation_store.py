@@ -0,0 +1,184 @@
+"""
+Persistent correlation graph store
+Keeps correlation edges and incident groups on disk so restarts don't rescore incidents
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+class CorrelationStore:
+    """SQLite-backed store for pairwise correlation scores and incident groups"""
+
+    def __init__(self, db_path: str = "data/correlation_graph.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Shared with the background reconciliation thread, so guard with a lock
+        self.connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create tables and indexes if they don't exist yet"""
+        with self._lock, self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS correlation_edges (
+                    source_id TEXT NOT NULL,
+                    target_id TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    PRIMARY KEY (source_id, target_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_edges_target ON correlation_edges(target_id);
+                CREATE INDEX IF NOT EXISTS idx_edges_score ON correlation_edges(score);
+
+                CREATE TABLE IF NOT EXISTS correlation_groups (
+                    group_id TEXT NOT NULL,
+                    incident_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    avg_similarity REAL NOT NULL,
+                    PRIMARY KEY (group_id, incident_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_groups_incident ON correlation_groups(incident_id);
+
+                CREATE TABLE IF NOT EXISTS store_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+
+    @staticmethod
+    def _edge_key(incident_id1: str, incident_id2: str) -> Tuple[str, str]:
+        """Similarity is symmetric, so each pair is stored once in sorted order"""
+        return (incident_id1, incident_id2) if incident_id1 < incident_id2 else (incident_id2, incident_id1)
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, float]]):
+        """Persist scored incident pairs in a single transaction"""
+        rows = [(*self._edge_key(id1, id2), score) for id1, id2, score in edges]
+        if not rows:
+            return
+
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO correlation_edges (source_id, target_id, score) VALUES (?, ?, ?)",
+                rows
+            )
+
+    def get_incident_edges(self, incident_id: str) -> Dict[str, float]:
+        """Get all stored scores involving one incident (uses the id indexes)"""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT source_id, target_id, score FROM correlation_edges "
+                "WHERE source_id = ? OR target_id = ?",
+                (incident_id, incident_id)
+            ).fetchall()
+
+        return {(target if source == incident_id else source): score for source, target, score in rows}
+
+    def get_strong_edges(self, min_score: float) -> List[Tuple[str, str, float]]:
+        """Get all stored pairs at or above a score (uses the score index)"""
+        with self._lock:
+            return self.connection.execute(
+                "SELECT source_id, target_id, score FROM correlation_edges WHERE score >= ? "
+                "ORDER BY score DESC",
+                (min_score,)
+            ).fetchall()
+
+    def load_correlation_matrix(self, incident_ids: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        """Load the stored scores between the given incidents as a symmetric matrix"""
+
+        incident_ids = list(dict.fromkeys(incident_ids))
+        matrix = {incident_id: {} for incident_id in incident_ids}
+
+        # Commit the temp-table writes so no transaction (and its lock) outlives the read
+        with self._lock, self.connection:
+            self.connection.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS wanted_incidents (incident_id TEXT PRIMARY KEY)"
+            )
+            self.connection.execute("DELETE FROM wanted_incidents")
+            self.connection.executemany(
+                "INSERT INTO wanted_incidents (incident_id) VALUES (?)",
+                [(incident_id,) for incident_id in incident_ids]
+            )
+            rows = self.connection.execute(
+                "SELECT e.source_id, e.target_id, e.score FROM correlation_edges e "
+                "JOIN wanted_incidents a ON e.source_id = a.incident_id "
+                "JOIN wanted_incidents b ON e.target_id = b.incident_id"
+            ).fetchall()
+
+        for source, target, score in rows:
+            matrix[source][target] = score
+            matrix[target][source] = score
+
+        return matrix
+
+    def save_groups(self, groups: List[Dict], threshold: float, incident_ids: Iterable[str]):
+        """Replace stored groups with a fresh clustering of the given incidents"""
+
+        rows = []
+        for group in groups:
+            for position, incident_id in enumerate(group['incident_ids']):
+                rows.append((group['group_id'], incident_id, position, group['avg_similarity']))
+
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM correlation_groups")
+            self.connection.executemany(
+                "INSERT INTO correlation_groups (group_id, incident_id, position, avg_similarity) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+                [('group_threshold', repr(threshold)),
+                 ('group_signature', self._signature(incident_ids))]
+            )
+
+    def load_groups(self, threshold: float, incident_ids: Iterable[str]) -> Optional[List[Dict]]:
+        """Load stored groups if they were built for the same incidents and threshold"""
+
+        with self._lock:
+            meta = dict(self.connection.execute("SELECT key, value FROM store_meta").fetchall())
+            if (meta.get('group_threshold') != repr(threshold) or
+                    meta.get('group_signature') != self._signature(incident_ids)):
+                return None
+
+            rows = self.connection.execute(
+                "SELECT group_id, incident_id, avg_similarity FROM correlation_groups "
+                "ORDER BY rowid"
+            ).fetchall()
+
+        groups = {}
+        for group_id, incident_id, avg_similarity in rows:
+            group = groups.setdefault(group_id, {
+                'group_id': group_id,
+                'incident_ids': [],
+                'avg_similarity': avg_similarity
+            })
+            group['incident_ids'].append(incident_id)
+
+        return list(groups.values())
+
+    @staticmethod
+    def _signature(incident_ids: Iterable[str]) -> str:
+        """Stable fingerprint of an incident set"""
+        digest = hashlib.sha1()
+        for incident_id in sorted(set(incident_ids)):
+            digest.update(incident_id.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get_stats(self) -> Dict:
+        """Get store size statistics"""
+        with self._lock:
+            edges = self.connection.execute("SELECT COUNT(*) FROM correlation_edges").fetchone()[0]
+            groups = self.connection.execute(
+                "SELECT COUNT(DISTINCT group_id) FROM correlation_groups"
+            ).fetchone()[0]
+        return {'stored_edges': edges, 'stored_groups': groups}
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self.connection.close()
@@ -3,12 +3,15 @@ Data loader utility for sample ITSM data
 """
 
 import json
+import sys
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional, TextIO, Union
 from pathlib import Path
 
 from ..models.incident import Incident, SeverityLevel, IncidentStatus
 from ..models.alert import Alert, AlertSeverity, AlertStatus
+from .metric_store import MetricStore, PreparedMetrics
+from .metric_archive import MetricArchive
 from datetime import timedelta
 
 class DataLoader:
@@ -23,6 +26,9 @@ class DataLoader:
             # Try relative to current file
             current_dir = Path(__file__).parent.parent.parent
             self.data_dir = current_dir / data_dir
+        
+        # Malformed lines skipped by the last streaming read
+        self.skipped_metric_lines = 0
     
     def load_incidents(self) -> List[Incident]:
         """Load incidents from JSON file"""
@@ -108,6 +114,80 @@ class DataLoader:
         with open(metrics_file, 'r') as f:
             return json.load(f)
     
+    @staticmethod
+    def parse_metric_line(line: str) -> Optional[Dict]:
+        """Parse one NDJSON metric point, or None if the line is malformed"""
+        try:
+            point = json.loads(line)
+            metric_name = point.get('metric', point.get('metric_name'))
+            if not metric_name:
+                return None
+            return {
+                'metric': metric_name,
+                'timestamp': point['timestamp'],
+                'value': float(point['value']),
+                'resource': point.get('resource', '')
+            }
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+    
+    def iter_metric_chunks(self, source: Union[str, TextIO], chunk_size: int = 10000) -> Iterator[List[Dict]]:
+        """Stream newline-delimited metric points in bounded chunks ('-' reads stdin)
+        
+        Each line is one point: {"metric": ..., "timestamp": ..., "value": ..., "resource": ...}
+        """
+        if source == '-':
+            stream, close_stream = sys.stdin, False
+        elif isinstance(source, str):
+            stream, close_stream = open(source, 'r'), True
+        else:
+            stream, close_stream = source, False
+        
+        self.skipped_metric_lines = 0
+        chunk = []
+        try:
+            for line in stream:
+                line = line.strip()
+                if not line:
+                    continue
+                point = self.parse_metric_line(line)
+                if point is None:
+                    # Skip malformed lines rather than abort a multi-gigabyte export
+                    self.skipped_metric_lines += 1
+                    continue
+                chunk.append(point)
+                
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            
+            if chunk:
+                yield chunk
+        finally:
+            if close_stream:
+                stream.close()
+    
+    def load_metric_archive(self, archive_path: Optional[str] = None) -> Optional[MetricArchive]:
+        """Open the binary metric archive (memory-mapped) if one exists"""
+        path = Path(archive_path) if archive_path else self.data_dir / "metrics_archive.bin"
+        return MetricArchive(str(path)) if path.exists() else None
+    
+    def load_prepared_metrics(self) -> PreparedMetrics:
+        """Prepared series from the binary archive when it is up to date, else from the JSON metrics"""
+        archive_file = self.data_dir / "metrics_archive.bin"
+        metrics_file = self.data_dir / "sample_metrics.json"
+        if archive_file.exists():
+            # An archive older than its JSON source would shadow the newer metrics
+            if metrics_file.exists() and metrics_file.stat().st_mtime > archive_file.stat().st_mtime:
+                print(f"⚠️ {archive_file.name} is older than {metrics_file.name}; reading the JSON metrics")
+            else:
+                return MetricArchive(str(archive_file)).prepared()
+        return PreparedMetrics.prepare(self.load_metrics())
+    
+    def load_metric_store(self) -> MetricStore:
+        """Load metrics once into columnar series (parsed timestamps, encoded resources)"""
+        return MetricStore.from_dict(self.load_metrics())
+    
     def get_correlation_demo_data(self) -> List[Incident]:
         """Get incidents specifically for correlation demo"""
         incidents = self.load_incidents()
@@ -0,0 +1,170 @@
+"""
+Binary metric archive
+Fixed-width per-series columns (int64 epoch microseconds, float64 values) behind a small JSON index,
+read through numpy.memmap so opening an archive costs only the header
+"""
+
+import json
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .metric_store import MetricSeries, MetricStore, PreparedMetrics, PreparedSeries
+
+MAGIC = b'ITSMMTRC'
+VERSION = 1
+# magic, version, index length
+PREAMBLE = struct.Struct('<8sII')
+ALIGNMENT = 8
+
+TIMESTAMP_DTYPE = np.dtype('<i8')
+VALUE_DTYPE = np.dtype('<f8')
+
+def _aligned(length: int) -> int:
+    return (length + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def write_archive(archive_path: str, metrics_data) -> Dict:
+    """Write metrics (JSON layout, MetricStore or PreparedMetrics) as a binary archive
+
+    Series are validated once here (sorted, finite values only), so readers can use the
+    columns as-is without touching every page.
+    """
+    prepared = metrics_data if isinstance(metrics_data, PreparedMetrics) else PreparedMetrics.prepare(metrics_data)
+
+    entries = []
+    offset = 0
+    for series in prepared:
+        count = len(series.values)
+        entries.append({
+            'metric': series.metric_name,
+            'resource': series.resource,
+            'count': count,
+            'first_timestamp': int(series.timestamps[0]),
+            'last_timestamp': int(series.timestamps[-1]),
+            'timestamps_offset': offset,
+            'values_offset': offset + count * TIMESTAMP_DTYPE.itemsize
+        })
+        offset += count * (TIMESTAMP_DTYPE.itemsize + VALUE_DTYPE.itemsize)
+
+    index = json.dumps({'series': entries}).encode('utf-8')
+    index_length = _aligned(PREAMBLE.size + len(index)) - PREAMBLE.size
+
+    path = Path(archive_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(PREAMBLE.pack(MAGIC, VERSION, index_length))
+            f.write(index.ljust(index_length, b' '))
+            for series in prepared:
+                f.write(series.timestamps.astype(TIMESTAMP_DTYPE, copy=False).tobytes())
+                f.write(series.values.astype(VALUE_DTYPE, copy=False).tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return {'series': len(entries), 'points': sum(entry['count'] for entry in entries),
+            'bytes': PREAMBLE.size + index_length + offset}
+
+class MetricArchive:
+    """Read-only, memory-mapped view of a binary metric archive"""
+
+    def __init__(self, archive_path: str):
+        self.archive_path = Path(archive_path)
+
+        with open(self.archive_path, 'rb') as f:
+            magic, version, index_length = PREAMBLE.unpack(f.read(PREAMBLE.size))
+            if magic != MAGIC:
+                raise ValueError(f"{archive_path} is not a metric archive")
+            if version != VERSION:
+                raise ValueError(f"Unsupported metric archive version {version} in {archive_path}")
+            self.index = json.loads(f.read(index_length).decode('utf-8'))
+
+        self.data_offset = PREAMBLE.size + index_length
+        self.entries = {(entry['metric'], entry['resource']): entry for entry in self.index['series']}
+
+        # One mapping for the whole data section; pages load only when a column is read
+        data_size = self.archive_path.stat().st_size - self.data_offset
+        self._data = (np.memmap(self.archive_path, dtype=np.uint8, mode='r', offset=self.data_offset,
+                                shape=(data_size,)) if data_size else np.empty(0, dtype=np.uint8))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return iter(self.entries)
+
+    def series(self, metric_name: str, resource: str = "") -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Zero-copy (timestamps, values) views for one series"""
+        entry = self.entries.get((metric_name, resource))
+        if entry is None:
+            return None
+
+        count = entry['count']
+        timestamps = self._data[entry['timestamps_offset']:
+                                entry['timestamps_offset'] + count * TIMESTAMP_DTYPE.itemsize].view(TIMESTAMP_DTYPE)
+        values = self._data[entry['values_offset']:
+                            entry['values_offset'] + count * VALUE_DTYPE.itemsize].view(VALUE_DTYPE)
+        return timestamps, values
+
+    def metric_names(self) -> List[str]:
+        return sorted({metric_name for metric_name, _ in self.entries})
+
+    def prepared(self) -> PreparedMetrics:
+        """Every series as prepared input for the monitoring agent, without copying or rescanning"""
+        started = time.perf_counter()
+        series = [PreparedSeries(metric_name, resource, *self.series(metric_name, resource))
+                  for metric_name, resource in self.entries]
+        return PreparedMetrics(series, parse_seconds=time.perf_counter() - started)
+
+    def to_store(self) -> MetricStore:
+        """Materialize the archive as an in-memory columnar store"""
+        series = {}
+        for metric_name in self.metric_names():
+            resources = [resource for name, resource in self.entries if name == metric_name]
+            columns = [self.series(metric_name, resource) for resource in resources]
+            series[metric_name] = MetricSeries(
+                metric_name=metric_name,
+                timestamps=np.concatenate([timestamps for timestamps, _ in columns]).astype(np.int64),
+                values=np.concatenate([values for _, values in columns]).astype(np.float64),
+                resource_codes=np.repeat(np.arange(len(resources), dtype=np.int32),
+                                         [len(values) for _, values in columns]),
+                resources=resources
+            )
+        return MetricStore(series)
+
+def main():
+    """Convert JSON metrics to the binary archive format, or describe an archive"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Binary metric archive tools")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    convert = subcommands.add_parser('convert', help='Convert a JSON metrics file to an archive')
+    convert.add_argument('source', help='JSON file in the sample_metrics.json layout')
+    convert.add_argument('output', help='Archive file to write')
+
+    info = subcommands.add_parser('info', help='List the series in an archive')
+    info.add_argument('archive', help='Archive file to read')
+
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        with open(args.source, 'r') as f:
+            metrics_data = json.load(f)
+        summary = write_archive(args.output, metrics_data)
+        print(f"✅ Wrote {summary['points']} points in {summary['series']} series "
+              f"({summary['bytes']} bytes) -> {args.output}")
+    else:
+        archive = MetricArchive(args.archive)
+        for (metric_name, resource), entry in archive.entries.items():
+            print(f"📦 {metric_name} on {resource or '-'}: {entry['count']} points")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Columnar metric time-series store
+Built once at load time: int64 epoch timestamps, float64 values and dictionary-encoded resources
+"""
+
+import time
+import warnings
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+EPOCH = datetime(1970, 1, 1)
+MICROS_PER_SECOND = 1_000_000
+MICROS_PER_HOUR = 3600 * MICROS_PER_SECOND
+
+def to_epoch_micros(timestamp: datetime) -> int:
+    """Convert a datetime to epoch microseconds (naive values are taken as-is, aware as UTC)"""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - EPOCH) // timedelta(microseconds=1)
+
+def from_epoch_micros(micros: int) -> datetime:
+    """Convert epoch microseconds back to a naive datetime"""
+    return EPOCH + timedelta(microseconds=int(micros))
+
+def parse_timestamps(timestamps: List[str]) -> np.ndarray:
+    """Parse ISO-8601 strings to int64 epoch microseconds in one vectorized pass"""
+    try:
+        with warnings.catch_warnings():
+            # numpy only warns about UTC offsets, so treat that as "use the slow path"
+            warnings.simplefilter('error')
+            return np.array(timestamps, dtype='datetime64[us]').astype(np.int64)
+    except (ValueError, UserWarning, DeprecationWarning):
+        return np.array([to_epoch_micros(datetime.fromisoformat(ts)) for ts in timestamps], dtype=np.int64)
+
+@dataclass
+class MetricSeries:
+    """All points of one metric as parallel columns"""
+    metric_name: str
+    timestamps: np.ndarray      # int64 epoch microseconds
+    values: np.ndarray          # float64
+    resource_codes: np.ndarray  # int32 index into resources
+    resources: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @classmethod
+    def from_points(cls, metric_name: str, points: List[Dict]) -> 'MetricSeries':
+        """Build columns from a list of {'timestamp', 'value', 'resource'} dicts"""
+
+        resources = []
+        resource_index = {}
+        codes = np.empty(len(points), dtype=np.int32)
+        for i, point in enumerate(points):
+            resource = point.get('resource', '')
+            code = resource_index.get(resource)
+            if code is None:
+                code = resource_index[resource] = len(resources)
+                resources.append(resource)
+            codes[i] = code
+
+        return cls(
+            metric_name=metric_name,
+            timestamps=parse_timestamps([point['timestamp'] for point in points]),
+            values=np.array([point['value'] for point in points], dtype=np.float64),
+            resource_codes=codes,
+            resources=resources
+        )
+
+    def split_by_resource(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Split into per-resource (timestamps, values) in one vectorized pass"""
+
+        if not len(self.values):
+            return {}
+
+        # Stable sort keeps each resource's points in their original order
+        order = np.argsort(self.resource_codes, kind='stable')
+        codes = self.resource_codes[order]
+        boundaries = np.flatnonzero(np.diff(codes)) + 1
+        starts = np.concatenate(([0], boundaries))
+
+        timestamps = np.split(self.timestamps[order], boundaries)
+        values = np.split(self.values[order], boundaries)
+
+        return {self.resources[codes[start]]: (resource_timestamps, resource_values)
+                for start, resource_timestamps, resource_values in zip(starts, timestamps, values)}
+
+    def to_points(self) -> List[Dict]:
+        """Convert back to the JSON point layout"""
+        return [{
+            'timestamp': from_epoch_micros(ts).isoformat(),
+            'value': float(value),
+            'resource': self.resources[code]
+        } for ts, value, code in zip(self.timestamps, self.values, self.resource_codes)]
+
+class MetricStore:
+    """Columnar series for every metric, keyed by metric name"""
+
+    def __init__(self, series: Optional[Dict[str, MetricSeries]] = None):
+        self.series = series or {}
+
+    @classmethod
+    def from_dict(cls, metrics_data: Dict) -> 'MetricStore':
+        """Build the store from the JSON layout returned by DataLoader.load_metrics"""
+        return cls({metric_name: MetricSeries.from_points(metric_name, points)
+                    for metric_name, points in metrics_data.items()})
+
+    def to_dict(self) -> Dict:
+        """Convert back to the JSON layout"""
+        return {metric_name: series.to_points() for metric_name, series in self.series.items()}
+
+    def __iter__(self) -> Iterator[MetricSeries]:
+        return iter(self.series.values())
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def __contains__(self, metric_name: str) -> bool:
+        return metric_name in self.series
+
+    def get(self, metric_name: str) -> Optional[MetricSeries]:
+        return self.series.get(metric_name)
+
+    def metric_names(self) -> List[str]:
+        return list(self.series)
+
+@dataclass
+class PreparedSeries:
+    """One validated per-resource series, ready for every analysis stage"""
+    metric_name: str
+    resource: str
+    timestamps: np.ndarray  # int64 epoch microseconds, ascending
+    values: np.ndarray      # float64, all finite
+
+class PreparedMetrics:
+    """Metrics parsed, split per resource and validated exactly once per run"""
+
+    def __init__(self, series: Optional[List[PreparedSeries]] = None, parse_seconds: float = 0.0,
+                 dropped_points: int = 0):
+        self.series = series or []
+        self.parse_seconds = parse_seconds
+        self.dropped_points = dropped_points
+
+    @classmethod
+    def prepare(cls, metrics_data: Union[Dict, MetricStore]) -> 'PreparedMetrics':
+        """Parse timestamps, split by resource and drop unusable points in one pass"""
+
+        started = time.perf_counter()
+        store = metrics_data if isinstance(metrics_data, MetricStore) else MetricStore.from_dict(metrics_data)
+
+        prepared = []
+        dropped = 0
+        for metric_series in store:
+            for resource, (timestamps, values) in metric_series.split_by_resource().items():
+                finite = np.isfinite(values)
+                if not finite.all():
+                    dropped += int((~finite).sum())
+                    timestamps, values = timestamps[finite], values[finite]
+
+                # Out-of-order points are reordered so every stage sees ascending time
+                if len(timestamps) > 1 and (np.diff(timestamps) < 0).any():
+                    order = np.argsort(timestamps, kind='stable')
+                    timestamps, values = timestamps[order], values[order]
+
+                if len(values):
+                    prepared.append(PreparedSeries(metric_series.metric_name, resource, timestamps, values))
+
+        return cls(prepared, parse_seconds=time.perf_counter() - started, dropped_points=dropped)
+
+    def __iter__(self) -> Iterator[PreparedSeries]:
+        return iter(self.series)
+
+    def __len__(self) -> int:
+        return len(self.series)
@@ -0,0 +1,197 @@
+"""
+Watched metrics directory
+Incrementally ingests new and appended metric drop files, tracked by a manifest of processed files
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .loader import DataLoader
+from .metric_store import parse_timestamps
+
+class MetricsDirectoryWatcher:
+    """Polls a directory for metric files and returns only points not processed before
+
+    Two file formats are accepted:
+    - NDJSON (one point per line): read from the stored byte offset, so appends cost only the new bytes
+    - The JSON layout of sample_metrics.json: read whole when new or changed, keeping only
+      points newer than the file's high-water timestamp
+
+    poll() only stages manifest updates; commit() applies and persists them once the points
+    were processed, so a failed analysis re-reads the same data on the next poll.
+    """
+
+    def __init__(self, directory: str = "data/metrics", pattern: str = "*.json",
+                 manifest_path: Optional[str] = None):
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.manifest_path = Path(manifest_path) if manifest_path else self.directory / ".manifest.json"
+
+        # file name -> {'mtime', 'size', 'offset', 'format', 'high_water'}
+        self.manifest: Dict[str, Dict] = {}
+        # Manifest entries for the data returned by the last poll, applied by commit()
+        self.pending: Dict[str, Dict] = {}
+        self.skipped_lines = 0
+        self.load_manifest()
+
+    def load_manifest(self):
+        """Restore the processed-file manifest from disk"""
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+
+    def commit(self):
+        """Mark the data from the last poll as processed and persist the manifest"""
+        self.manifest.update(self.pending)
+        self.pending = {}
+        self.save_manifest()
+
+    def save_manifest(self):
+        """Persist the manifest atomically"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.manifest_path.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.manifest, f)
+            os.replace(tmp_path, self.manifest_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def changed_files(self) -> List[os.DirEntry]:
+        """Files that are new or whose mtime/size differ from the manifest (one directory listing)"""
+        if not self.directory.exists():
+            return []
+
+        changed = []
+        present = set()
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                # Dot files (including the manifest itself) are never metric drops
+                if entry.name.startswith('.') or not entry.is_file() or not Path(entry.name).match(self.pattern):
+                    continue
+                present.add(entry.name)
+                stat = entry.stat()
+                known = self.manifest.get(entry.name)
+                if known is None or known['mtime'] != stat.st_mtime_ns or known['size'] != stat.st_size:
+                    changed.append(entry)
+
+        # Forget files that were deleted or rotated away so the manifest stays small
+        for name in set(self.manifest) - present:
+            del self.manifest[name]
+
+        return sorted(changed, key=lambda entry: (entry.stat().st_mtime_ns, entry.name))
+
+    def poll(self) -> List[Dict]:
+        """Read every new or appended point as {'metric', 'timestamp', 'value', 'resource'}"""
+
+        points = []
+        self.pending = {}
+        for entry in self.changed_files():
+            stat = entry.stat()
+            known = dict(self.manifest.get(entry.name) or {'offset': 0, 'format': None, 'high_water': None})
+
+            # A file that shrank was truncated or replaced: start over
+            if stat.st_size < known['offset']:
+                known = {'offset': 0, 'format': None, 'high_water': None}
+
+            if known['format'] is None:
+                known['format'] = self._detect_format(entry.path)
+
+            if known['format'] == 'layout':
+                new_points, high_water = self._read_layout(entry.path, known['high_water'])
+                if new_points is None:
+                    # Incomplete document (or NDJSON whose first line was still being written):
+                    # stage nothing, so the next poll re-reads it and detects the format again
+                    continue
+                known['high_water'] = high_water
+                known['offset'] = stat.st_size
+            else:
+                new_points, known['offset'] = self._read_ndjson(entry.path, known['offset'])
+
+            points.extend(new_points)
+            known.update({'mtime': stat.st_mtime_ns, 'size': stat.st_size})
+            self.pending[entry.name] = known
+
+        return points
+
+    @staticmethod
+    def _valid_timestamp(timestamp) -> bool:
+        """True if a point's timestamp parses as ISO-8601"""
+        try:
+            parse_timestamps([timestamp])
+            return True
+        except (ValueError, TypeError):
+            return False
+
+    @staticmethod
+    def _detect_format(path: str) -> str:
+        """'layout' for a {metric: [points]} document, otherwise 'ndjson'"""
+        with open(path, 'rb') as f:
+            head = f.read(4096).lstrip()
+        if not head.startswith(b'{'):
+            return 'ndjson'
+        first_line = head.split(b'\n', 1)[0]
+        return 'ndjson' if DataLoader.parse_metric_line(first_line.decode('utf-8', 'replace')) else 'layout'
+
+    def _read_ndjson(self, path: str, offset: int):
+        """Points from complete lines after `offset`; a partial last line waits for the next poll"""
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+
+        complete = data.rfind(b'\n') + 1
+        points = []
+        for line in data[:complete].decode('utf-8', 'replace').splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            point = DataLoader.parse_metric_line(line)
+            if point is None:
+                self.skipped_lines += 1
+                continue
+            points.append(point)
+
+        return points, offset + complete
+
+    def _read_layout(self, path: str, high_water: Optional[int]):
+        """Points newer than the file's high-water mark, plus the new mark (None if unreadable)"""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except ValueError:
+            # Probably still being written; nothing is staged, so the next poll reads it again
+            return None, high_water
+
+        # Malformed points are skipped and counted, so one bad drop can't block the directory
+        points = []
+        for metric_name, metric_points in (data.items() if isinstance(data, dict) else []):
+            for point in (metric_points if isinstance(metric_points, list) else []):
+                try:
+                    points.append({
+                        'metric': metric_name,
+                        'timestamp': point['timestamp'],
+                        'value': float(point['value']),
+                        'resource': point.get('resource', '')
+                    })
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    self.skipped_lines += 1
+        if not points:
+            return [], high_water
+
+        try:
+            timestamps = parse_timestamps([point['timestamp'] for point in points])
+        except (ValueError, TypeError):
+            valid = [point for point in points if self._valid_timestamp(point['timestamp'])]
+            self.skipped_lines += len(points) - len(valid)
+            points = valid
+            if not points:
+                return [], high_water
+            timestamps = parse_timestamps([point['timestamp'] for point in points])
+        newest = int(timestamps.max())
+        if high_water is None:
+            return points, newest
+        return [point for point, newer in zip(points, timestamps > high_water) if newer], max(high_water, newest)
@@ -0,0 +1,63 @@
+"""
+Local store for published monitoring results
+The monitoring daemon writes each tick's result here and the Streamlit UI reads it back
+"""
+
+import json
+import os
+import tempfile
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+def to_jsonable(value: Any) -> Any:
+    """Convert agent outputs (dataclasses, enums, datetimes, NumPy scalars) to JSON types"""
+    if is_dataclass(value) and not isinstance(value, type):
+        return to_jsonable(asdict(value))
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+class MonitoringResultStore:
+    """Latest published monitoring result in a JSON file, replaced atomically"""
+
+    def __init__(self, file_path: str = "data/monitoring_results.json"):
+        self.file_path = Path(file_path)
+
+    def publish(self, result: Dict, tick: int = 0):
+        """Write a result so readers always see a complete snapshot"""
+
+        snapshot = {
+            'published_at': datetime.now().isoformat(),
+            'tick': tick,
+            'result': to_jsonable(result)
+        }
+
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.file_path.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot, f, indent=2)
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load_latest(self) -> Optional[Dict]:
+        """Read the most recent snapshot, or None if nothing was published yet"""
+        if not self.file_path.exists():
+            return None
+        with open(self.file_path, 'r') as f:
+            return json.load(f)
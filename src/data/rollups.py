@@ -0,0 +1,232 @@
+"""
+Tiered metric rollups
+Per-series min/max/sum/count/last at 1-minute, 1-hour and 1-day resolution with per-tier retention
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .metric_store import MICROS_PER_SECOND
+
+# (name, bucket width in seconds), finest first
+ROLLUP_TIERS = [
+    ('1m', 60),
+    ('1h', 3600),
+    ('1d', 86400)
+]
+
+# Default retention per tier in seconds, measured back from the newest bucket
+DEFAULT_RETENTION = {
+    '1m': 2 * 86400,
+    '1h': 90 * 86400,
+    '1d': 5 * 365 * 86400
+}
+
+class RollupTier:
+    """Fixed-width buckets for one series, kept as parallel sorted columns"""
+
+    def __init__(self, name: str, resolution_seconds: int, retention_seconds: Optional[int] = None):
+        self.name = name
+        self.resolution = resolution_seconds * MICROS_PER_SECOND
+        self.retention = retention_seconds * MICROS_PER_SECOND if retention_seconds else None
+
+        self.starts = np.empty(0, dtype=np.int64)
+        self.mins = np.empty(0)
+        self.maxs = np.empty(0)
+        self.sums = np.empty(0)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.lasts = np.empty(0)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def update(self, timestamps: np.ndarray, values: np.ndarray):
+        """Fold new points into buckets; only the affected tail is re-aggregated"""
+
+        if not len(values):
+            return
+
+        starts = timestamps - timestamps % self.resolution
+
+        # Existing buckets at or after the earliest new bucket are merged with the new points
+        keep = int(np.searchsorted(self.starts, starts.min()))
+        tail = slice(keep, None)
+        merged_starts = np.concatenate((self.starts[tail], starts))
+        merged_mins = np.concatenate((self.mins[tail], values))
+        merged_maxs = np.concatenate((self.maxs[tail], values))
+        merged_sums = np.concatenate((self.sums[tail], values))
+        merged_counts = np.concatenate((self.counts[tail], np.ones(len(values), dtype=np.int64)))
+        merged_lasts = np.concatenate((self.lasts[tail], values))
+
+        # Stable sort keeps arrival order within a bucket, so "last" is the latest point
+        order = np.argsort(merged_starts, kind='stable')
+        merged_starts = merged_starts[order]
+        boundaries = np.concatenate(([0], np.flatnonzero(np.diff(merged_starts)) + 1))
+        group_ends = np.concatenate((boundaries[1:], [len(merged_starts)])) - 1
+
+        self.starts = np.concatenate((self.starts[:keep], merged_starts[boundaries]))
+        self.mins = np.concatenate((self.mins[:keep], np.minimum.reduceat(merged_mins[order], boundaries)))
+        self.maxs = np.concatenate((self.maxs[:keep], np.maximum.reduceat(merged_maxs[order], boundaries)))
+        self.sums = np.concatenate((self.sums[:keep], np.add.reduceat(merged_sums[order], boundaries)))
+        self.counts = np.concatenate((self.counts[:keep], np.add.reduceat(merged_counts[order], boundaries)))
+        self.lasts = np.concatenate((self.lasts[:keep], merged_lasts[order][group_ends]))
+
+        self._apply_retention()
+
+    def _apply_retention(self):
+        """Drop buckets older than the retention window"""
+        if self.retention is None or not len(self.starts):
+            return
+        cutoff = int(np.searchsorted(self.starts, self.starts[-1] - self.retention))
+        if cutoff:
+            for column in ('starts', 'mins', 'maxs', 'sums', 'counts', 'lasts'):
+                setattr(self, column, getattr(self, column)[cutoff:])
+
+    def covers(self, start: int) -> bool:
+        """Whether this tier still holds buckets back to `start`"""
+        return bool(len(self.starts)) and self.starts[0] <= start
+
+    def query(self, start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Buckets whose start falls in [start, end]"""
+        lo = int(np.searchsorted(self.starts, start - start % self.resolution)) if start is not None else 0
+        hi = int(np.searchsorted(self.starts, end, side='right')) if end is not None else len(self.starts)
+        counts = self.counts[lo:hi]
+        return {
+            'tier': self.name,
+            'starts': self.starts[lo:hi],
+            'min': self.mins[lo:hi],
+            'max': self.maxs[lo:hi],
+            'mean': self.sums[lo:hi] / np.maximum(counts, 1),
+            'sum': self.sums[lo:hi],
+            'count': counts,
+            'last': self.lasts[lo:hi]
+        }
+
+    def to_dict(self) -> Dict:
+        """Serialize buckets for persistence"""
+        return {
+            'starts': self.starts.tolist(),
+            'mins': self.mins.tolist(),
+            'maxs': self.maxs.tolist(),
+            'sums': self.sums.tolist(),
+            'counts': self.counts.tolist(),
+            'lasts': self.lasts.tolist()
+        }
+
+    def load_dict(self, data: Dict):
+        """Restore buckets saved by to_dict"""
+        self.starts = np.array(data['starts'], dtype=np.int64)
+        self.mins = np.array(data['mins'], dtype=np.float64)
+        self.maxs = np.array(data['maxs'], dtype=np.float64)
+        self.sums = np.array(data['sums'], dtype=np.float64)
+        self.counts = np.array(data['counts'], dtype=np.int64)
+        self.lasts = np.array(data['lasts'], dtype=np.float64)
+
+class SeriesRollups:
+    """All rollup tiers for one (metric, resource) series"""
+
+    def __init__(self, retention: Optional[Dict[str, int]] = None):
+        retention = {**DEFAULT_RETENTION, **(retention or {})}
+        self.tiers = [RollupTier(name, seconds, retention.get(name)) for name, seconds in ROLLUP_TIERS]
+        self.first_timestamp: Optional[int] = None
+        self.last_timestamp: Optional[int] = None
+
+    def update(self, timestamps: np.ndarray, values: np.ndarray):
+        """Fold new points into every tier"""
+        if not len(values):
+            return
+        if self.first_timestamp is None:
+            self.first_timestamp = int(timestamps.min())
+        self.last_timestamp = max(int(timestamps.max()), self.last_timestamp or self.first_timestamp)
+        for tier in self.tiers:
+            tier.update(timestamps, values)
+
+    def _range_start(self, tier: RollupTier, start: Optional[int]) -> Optional[int]:
+        """First whole bucket of `tier` at or after `start` (None when the range reaches the first point)"""
+        if start is None or start <= self.first_timestamp:
+            return None
+        return start + (-start) % tier.resolution
+
+    def select_tier(self, start: Optional[int] = None, min_buckets: int = 1) -> Optional[RollupTier]:
+        """Coarsest tier no wider than the range with at least `min_buckets` whole buckets after `start`"""
+
+        if self.first_timestamp is None:
+            return None
+        range_start = self.first_timestamp if start is None else max(start, self.first_timestamp)
+        span = (self.last_timestamp or range_start) - range_start
+        candidates = [tier for tier in self.tiers
+                      if len(tier) and tier.covers(range_start - range_start % tier.resolution)]
+        for tier in reversed(candidates):
+            if tier.resolution > span:
+                continue
+            aligned = self._range_start(tier, start)
+            buckets = len(tier) - (int(np.searchsorted(tier.starts, aligned)) if aligned is not None else 0)
+            if buckets >= min_buckets:
+                return tier
+
+        if candidates:
+            # Nothing dense enough: fall back to the finest tier that still covers the range
+            return candidates[0]
+
+        # Range starts before every tier's retention: use the one reaching furthest back
+        populated = [tier for tier in self.tiers if len(tier)]
+        return min(populated, key=lambda tier: tier.starts[0]) if populated else None
+
+    def query(self, start: Optional[int] = None, end: Optional[int] = None,
+              min_buckets: int = 1) -> Optional[Dict[str, np.ndarray]]:
+        """Read a range from the coarsest tier that satisfies it"""
+        tier = self.select_tier(start, min_buckets)
+        if tier is None:
+            return None
+        result = self._query_from(tier, start, end)
+        if not len(result['starts']):
+            # Range shorter than one bucket and nothing finer retained: the straddling bucket is all there is
+            return tier.query(start, end)
+        return result
+
+    def _query_from(self, tier: RollupTier, start: Optional[int], end: Optional[int]) -> Dict[str, np.ndarray]:
+        """Whole buckets of `tier` from `start`, with a bucket straddling `start` replaced by finer tiers
+
+        Coarse buckets therefore never pull in data from before the range.
+        """
+        range_start = self._range_start(tier, start)
+        result = tier.query(range_start, end)
+        if range_start is None or range_start == start:
+            return result
+
+        finer = [other for other in self.tiers if other.resolution < tier.resolution and len(other) and
+                 other.covers(start - start % other.resolution)]
+        if not finer:
+            return result
+        head = self._query_from(finer[-1], start, range_start - 1)
+        return {name: column if name == 'tier' else np.concatenate((head[name], column))
+                for name, column in result.items()}
+
+    def to_dict(self) -> Dict:
+        """Serialize every tier for persistence"""
+        return {
+            'first_timestamp': self.first_timestamp,
+            'last_timestamp': self.last_timestamp,
+            'retention': {tier.name: tier.retention // MICROS_PER_SECOND if tier.retention else None
+                          for tier in self.tiers},
+            'tiers': {tier.name: tier.to_dict() for tier in self.tiers}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SeriesRollups':
+        """Restore rollups saved by to_dict"""
+        rollups = cls(retention=data.get('retention'))
+        rollups.first_timestamp = data.get('first_timestamp')
+        for tier in rollups.tiers:
+            if tier.name in data.get('tiers', {}):
+                tier.load_dict(data['tiers'][tier.name])
+        rollups.last_timestamp = data.get('last_timestamp')
+        if rollups.last_timestamp is None:
+            # Older state: the newest bucket start of the finest populated tier is close enough
+            populated = [tier for tier in rollups.tiers if len(tier)]
+            rollups.last_timestamp = int(populated[0].starts[-1]) if populated else None
+        return rollups
+
+    def tier_sizes(self) -> List[Tuple[str, int]]:
+        return [(tier.name, len(tier)) for tier in self.tiers]
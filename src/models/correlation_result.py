@@ -2,7 +2,7 @@
 Data models for agent decision results and correlation analysis
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional
 from enum import Enum
@@ -72,6 +72,20 @@ class MonitoringResult:
     # Agent decision tracking
     agent_id: str = "monitoring_agent"
     auto_executed: bool = False
+    suppressed: bool = False  # Action skipped because this alert was already acted on
+    
+    # Series the issue was detected on
+    metric_name: str = ""
+    resource: str = ""
+    
+    # Deduplication: repeat detections of the same fingerprint update one alert
+    fingerprint: str = ""
+    occurrence_count: int = 1
+    suppressed_actions: int = 0
+    
+    # Other anomalous metrics on the same resource that move with this one
+    related_metrics: List[str] = field(default_factory=list)
+    leading_indicator: str = ""
     
     def is_top_priority_issue(self) -> bool:
         """Check if this should be in top 3 issues list"""
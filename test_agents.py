@@ -96,5 +96,93 @@ def test_correlation_agent():
         import traceback
         traceback.print_exc()
 
+def test_change_point_detection():
+    """Test that the daily cycle is not reported as level shifts while real shifts are"""
+    try:
+        import math
+        import numpy as np
+        from datetime import datetime, timedelta
+        from src.agents.monitoring_agent import AutonomousMonitoringAgent
+        from src.data.metric_store import from_epoch_micros
+        
+        print("\n📐 Testing Change-Point Detection")
+        print("=" * 50)
+        
+        start = datetime(2024, 1, 1)
+        step_index = 3 * 288 + 50
+        
+        def daily_cycle(days, noise=0.0, step=0.0):
+            """5-minute CPU samples following a daily sine cycle, with an optional step on day 4"""
+            rng = np.random.default_rng(0)
+            return [{
+                'metric': 'cpu_usage',
+                'timestamp': (start + timedelta(minutes=5 * i)).isoformat(),
+                'value': (50 + 20 * math.sin(2 * math.pi * i / 288) + noise * rng.normal()
+                          + (step if i >= step_index else 0.0)),
+                'resource': 'web-01'
+            } for i in range(days * 288)]
+        
+        agent = AutonomousMonitoringAgent()
+        agent.ingest_metric_chunk(daily_cycle(7))
+        cycle_shifts = len(agent.series_state[('cpu_usage', 'web-01')].change_points)
+        print(f"   Pure daily cycle (7 days): {cycle_shifts} level shifts")
+        assert cycle_shifts == 0, "the daily cycle was reported as level shifts"
+        
+        agent = AutonomousMonitoringAgent()
+        agent.ingest_metric_chunk(daily_cycle(4, noise=1.0, step=2.0))
+        step_start = start + timedelta(minutes=5 * step_index)
+        detected = [change_point for change_point in agent.series_state[('cpu_usage', 'web-01')].change_points
+                    if change_point['direction'] == 'increase' and
+                    timedelta(0) <= from_epoch_micros(change_point['timestamp']) - step_start
+                    <= timedelta(hours=2)]
+        print(f"   2σ step on a noisy cycle: {'detected' if detected else 'missed'}")
+        assert detected, "a 2σ level shift was not detected"
+        
+        print(f"\n✅ Change-point detection test completed successfully!")
+        
+    except Exception as e:
+        print(f"❌ Error testing change-point detection: {e}")
+        import traceback
+        traceback.print_exc()
+
+def test_sharded_correlation_equivalence():
+    """Test that sharded correlation finds exactly the edges of brute-force pairwise scoring"""
+    try:
+        from src.agents.correlation_agent import AutonomousCorrelationAgent
+        from src.data.loader import DataLoader
+        
+        print("\n🧩 Testing Sharded Correlation Equivalence")
+        print("=" * 50)
+        
+        incidents = DataLoader().load_incidents()
+        agent = AutonomousCorrelationAgent()
+        
+        for threshold in (0.15, 0.4, 0.6, 0.9):
+            agent.correlation_threshold = threshold
+            
+            expected = set()
+            for i, incident1 in enumerate(incidents):
+                for incident2 in incidents[i + 1:]:
+                    similarity = agent.analyze_incident_similarity(incident1, incident2)
+                    if similarity >= threshold:
+                        expected.add((min(incident1.id, incident2.id), max(incident1.id, incident2.id), similarity))
+            
+            for max_workers in (1, 2):
+                result = agent.sharded_correlation_analysis(incidents, max_workers=max_workers)
+                found = {(min(id1, id2), max(id1, id2), similarity)
+                         for id1, id2, similarity in result['correlation_edges']}
+                assert found == expected, f"sharded edges differ from brute force at threshold {threshold}"
+            
+            print(f"   Threshold {threshold}: {len(expected)} edges match brute force")
+        
+        print(f"\n✅ Sharded correlation test completed successfully!")
+        
+    except Exception as e:
+        print(f"❌ Error testing sharded correlation: {e}")
+        import traceback
+        traceback.print_exc()
+
 if __name__ == "__main__":
-    test_correlation_agent()
\ No newline at end of file
+    test_correlation_agent()
+    test_change_point_detection()
+    test_sharded_correlation_equivalence()
\ No newline at end of file